@@ -2,6 +2,7 @@ from sqlalchemy import (
     TIMESTAMP,
     Column,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -25,6 +26,11 @@ class AccountState(Base):
     token_states = relationship("TokenState", back_populates="account_state", cascade="all, delete-orphan")
 
 
+# Serves per-account history pages in (timestamp, id) DESC keyset order
+Index("ix_account_states_account_timestamp_id",
+      AccountState.account_name, AccountState.timestamp.desc(), AccountState.id.desc())
+
+
 class TokenState(Base):
     __tablename__ = "token_states"
 
@@ -78,6 +84,10 @@ class Order(Base):
     trades = relationship("Trade", back_populates="order", cascade="all, delete-orphan")
 
 
+# Serves the per-account order history queries and their (created_at, id) keyset pagination
+Index("ix_orders_account_created_at_id", Order.account_name, Order.created_at.desc(), Order.id.desc())
+
+
 class Trade(Base):
     __tablename__ = "trades"
     
@@ -104,6 +114,10 @@ class Trade(Base):
     order = relationship("Order", back_populates="trades")
 
 
+# Serves the trade history (timestamp, id) keyset pagination
+Index("ix_trades_timestamp_id", Trade.timestamp.desc(), Trade.id.desc())
+
+
 class PositionSnapshot(Base):
     __tablename__ = "position_snapshots"
     
@@ -175,6 +189,10 @@ class FundingPayment(Base):
     exchange_funding_id = Column(String, nullable=True, index=True)  # Exchange funding ID
 
 
+# Serves the per-account, most-recent-first funding payment queries
+Index("ix_funding_payments_account_timestamp", FundingPayment.account_name, FundingPayment.timestamp.desc())
+
+
 class BotRun(Base):
     __tablename__ = "bot_runs"
     
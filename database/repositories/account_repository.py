@@ -1,20 +1,52 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
-import base64
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import json
 
-from sqlalchemy import desc, select, func
+from sqlalchemy import desc, select, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 
 from database import AccountState, TokenState
+from utils.pagination import decode_cursor, encode_cursor
+from utils.timestamp_clamp import clamp_range
 
 
 class AccountRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @staticmethod
+    def encode_cursor(timestamp: datetime, state_id: int) -> str:
+        """
+        Encode a (timestamp, id) keyset position as an opaque URL-safe cursor.
+        """
+        return encode_cursor(timestamp, state_id)
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[Optional[datetime], Optional[int]]:
+        """
+        Decode a cursor into its (timestamp, id) keyset position.
+        Plain ISO timestamps are still accepted and decode without an id; invalid cursors decode to (None, None).
+        """
+        timestamp, state_id = decode_cursor(cursor)
+        if timestamp is not None:
+            return timestamp, state_id
+        try:
+            return datetime.fromisoformat(cursor.replace('Z', '+00:00')), None
+        except (ValueError, TypeError):
+            # Invalid cursor, ignore it
+            return None, None
+
+    @staticmethod
+    def _apply_cursor(query, cursor_ts: Optional[datetime], cursor_id: Optional[int]):
+        """Restrict a history query to the rows strictly after the cursor position in (timestamp, id) DESC order."""
+        if cursor_ts is None:
+            return query
+        if cursor_id is None:
+            return query.filter(AccountState.timestamp < cursor_ts)
+        return query.filter(tuple_(AccountState.timestamp, AccountState.id) < tuple_(cursor_ts, cursor_id))
+
     async def save_account_state(self, account_name: str, connector_name: str, tokens_info: List[Dict], 
                                 snapshot_timestamp: Optional[datetime] = None) -> AccountState:
         """
@@ -103,11 +135,13 @@ class AccountRepository:
                                       limit: Optional[int] = None,
                                       account_name: Optional[str] = None,
                                       connector_name: Optional[str] = None,
-                                      cursor: Optional[str] = None,
+                                      cursor_ts: Optional[datetime] = None,
+                                      cursor_id: Optional[int] = None,
                                       start_time: Optional[datetime] = None,
-                                      end_time: Optional[datetime] = None) -> Tuple[List[Dict], Optional[str], bool]:
+                                      end_time: Optional[datetime] = None,
+                                      account_names: Optional[List[str]] = None) -> Tuple[List[Dict], Optional[str], bool]:
         """
-        Get historical account states with cursor-based pagination.
+        Get historical account states with keyset pagination on (timestamp, id).
         
         Returns:
             Tuple of (data, next_cursor, has_more)
@@ -115,12 +149,14 @@ class AccountRepository:
         query = (
             select(AccountState)
             .options(joinedload(AccountState.token_states))
-            .order_by(desc(AccountState.timestamp))
+            .order_by(desc(AccountState.timestamp), desc(AccountState.id))
         )
         
         # Apply filters
         if account_name:
             query = query.filter(AccountState.account_name == account_name)
+        if account_names:
+            query = query.filter(AccountState.account_name.in_(account_names))
         if connector_name:
             query = query.filter(AccountState.connector_name == connector_name)
         if start_time:
@@ -128,14 +164,8 @@ class AccountRepository:
         if end_time:
             query = query.filter(AccountState.timestamp <= end_time)
             
-        # Handle cursor-based pagination
-        if cursor:
-            try:
-                cursor_time = datetime.fromisoformat(cursor.replace('Z', '+00:00'))
-                query = query.filter(AccountState.timestamp < cursor_time)
-            except (ValueError, TypeError):
-                # Invalid cursor, ignore it
-                pass
+        # Handle keyset pagination
+        query = self._apply_cursor(query, cursor_ts, cursor_id)
         
         # Fetch limit + 1 to check if there are more records
         fetch_limit = limit + 1 if limit else 101
@@ -152,10 +182,12 @@ class AccountRepository:
         # Generate next cursor
         next_cursor = None
         if has_more and account_states:
-            next_cursor = account_states[-1].timestamp.isoformat()
+            next_cursor = self.encode_cursor(account_states[-1].timestamp, account_states[-1].id)
         
         # Format response - Group by minute to aggregate account/connector states
         minute_groups = {}
+        minute_timestamp = None
+        minute_key = None
         for account_state in account_states:
             token_info = []
             for token_state in account_state.token_states:
@@ -167,9 +199,12 @@ class AccountRepository:
                     "available_units": float(token_state.available_units)
                 })
             
-            # Round timestamp to the nearest minute for grouping
-            minute_timestamp = account_state.timestamp.replace(second=0, microsecond=0)
-            minute_key = minute_timestamp.isoformat()
+            # Round timestamp to the nearest minute for grouping. Rows are ordered by timestamp,
+            # so the formatted key is only recomputed when the minute changes
+            row_minute = account_state.timestamp.replace(second=0, microsecond=0)
+            if row_minute != minute_timestamp:
+                minute_timestamp = row_minute
+                minute_key = row_minute.isoformat()
             
             # Initialize minute group if it doesn't exist
             if minute_key not in minute_groups:
@@ -190,19 +225,104 @@ class AccountRepository:
         
         return history, next_cursor, has_more
     
+    async def iter_account_state_history(self,
+                                         limit: Optional[int] = None,
+                                         account_names: Optional[List[str]] = None,
+                                         connector_names: Optional[List[str]] = None,
+                                         cursor_ts: Optional[datetime] = None,
+                                         cursor_id: Optional[int] = None,
+                                         start_time: Optional[datetime] = None,
+                                         end_time: Optional[datetime] = None,
+                                         batch_size: int = 100) -> AsyncIterator[Dict]:
+        """
+        Stream historical account states grouped by minute, most recent first.
+        Rows are fetched from a server-side cursor in batches and each minute group is yielded
+        as soon as it is complete, so memory stays bounded regardless of the limit.
+        """
+        query = (
+            select(AccountState)
+            .options(selectinload(AccountState.token_states))
+            .order_by(desc(AccountState.timestamp), desc(AccountState.id))
+            .execution_options(yield_per=batch_size)
+        )
+
+        # Apply filters
+        if account_names:
+            query = query.filter(AccountState.account_name.in_(account_names))
+        if connector_names:
+            query = query.filter(AccountState.connector_name.in_(connector_names))
+        if start_time:
+            query = query.filter(AccountState.timestamp >= start_time)
+        if end_time:
+            query = query.filter(AccountState.timestamp <= end_time)
+        query = self._apply_cursor(query, cursor_ts, cursor_id)
+        if limit:
+            query = query.limit(limit)
+
+        # Rows are ordered by timestamp, so each minute group is contiguous in the stream
+        current_group = None
+        current_minute = None
+        result = await self.session.stream_scalars(query)
+        async for account_state in result:
+            row_minute = account_state.timestamp.replace(second=0, microsecond=0)
+            if current_group is None or row_minute != current_minute:
+                if current_group is not None:
+                    yield current_group
+                current_minute = row_minute
+                current_group = {"timestamp": row_minute.isoformat(), "state": {}}
+
+            current_group["state"].setdefault(account_state.account_name, {})[account_state.connector_name] = [
+                {
+                    "token": token_state.token,
+                    "units": float(token_state.units),
+                    "price": float(token_state.price),
+                    "value": float(token_state.value),
+                    "available_units": float(token_state.available_units)
+                }
+                for token_state in account_state.token_states
+            ]
+
+        if current_group is not None:
+            yield current_group
+
     async def get_account_current_state(self, account_name: str) -> Dict[str, List[Dict]]:
         """
         Get the current state for a specific account.
+        The latest snapshot search is first bounded to a recent window so it does not scan the whole history,
+        and only falls back to an unbounded search for accounts without recent snapshots.
         """
+        recent_start, _ = clamp_range(None, None)
+        account_states = await self._latest_account_states(account_name, recent_start)
+        if not account_states:
+            account_states = await self._latest_account_states(account_name, None)
+        
+        state = {}
+        for account_state in account_states:
+            token_info = []
+            for token_state in account_state.token_states:
+                token_info.append({
+                    "token": token_state.token,
+                    "units": float(token_state.units),
+                    "price": float(token_state.price),
+                    "value": float(token_state.value),
+                    "available_units": float(token_state.available_units)
+                })
+            state[account_state.connector_name] = token_info
+        
+        return state
+    
+    async def _latest_account_states(self, account_name: str, since: Optional[datetime]) -> List[AccountState]:
+        """Get the latest state snapshot of each connector of an account, only considering snapshots after since."""
         subquery = (
             select(
                 AccountState.connector_name,
                 func.max(AccountState.timestamp).label("max_timestamp")
             )
             .filter(AccountState.account_name == account_name)
-            .group_by(AccountState.connector_name)
-            .subquery()
         )
+        if since is not None:
+            subquery = subquery.filter(AccountState.timestamp >= since)
+        subquery = subquery.group_by(AccountState.connector_name).subquery()
         
         query = (
             select(AccountState)
@@ -216,23 +336,8 @@ class AccountRepository:
         )
         
         result = await self.session.execute(query)
-        account_states = result.unique().scalars().all()
-        
-        state = {}
-        for account_state in account_states:
-            token_info = []
-            for token_state in account_state.token_states:
-                token_info.append({
-                    "token": token_state.token,
-                    "units": float(token_state.units),
-                    "price": float(token_state.price),
-                    "value": float(token_state.value),
-                    "available_units": float(token_state.available_units)
-                })
-            state[account_state.connector_name] = token_info
-        
-        return state
-    
+        return result.unique().scalars().all()
+
     async def get_connector_current_state(self, account_name: str, connector_name: str) -> List[Dict]:
         """
         Get the current state for a specific connector.
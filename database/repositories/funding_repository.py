@@ -29,11 +29,28 @@ class FundingRepository:
         if trading_pair:
             query = query.where(FundingPayment.trading_pair == trading_pair)
             
-        query = query.order_by(FundingPayment.timestamp.desc()).limit(limit)
+        query = query.order_by(FundingPayment.timestamp.desc(), FundingPayment.trading_pair.desc()).limit(limit)
         
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def get_funding_payments_multi(self, account_name: str, connector_names: List[str],
+                                         trading_pair: str = None, limit: int = 100) -> List[FundingPayment]:
+        """Get funding payments of an account across several connectors in a single query."""
+        query = select(FundingPayment).where(
+            FundingPayment.account_name == account_name,
+            FundingPayment.connector_name.in_(connector_names)
+        )
+        if trading_pair:
+            query = query.where(FundingPayment.trading_pair == trading_pair)
+
+        query = query.order_by(
+            FundingPayment.timestamp.desc(), FundingPayment.connector_name.desc(), FundingPayment.trading_pair.desc()
+        ).limit(limit)
+
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
     async def get_total_funding_fees(self, account_name: str, connector_name: str, 
                                    trading_pair: str) -> Dict:
         """Get total funding fees for a specific trading pair."""
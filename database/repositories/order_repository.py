@@ -1,8 +1,8 @@
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from decimal import Decimal
 
-from sqlalchemy import desc, select
+from sqlalchemy import desc, func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.models import Order
@@ -81,17 +81,81 @@ class OrderRepository:
                         status: Optional[str] = None,
                         start_time: Optional[int] = None, 
                         end_time: Optional[int] = None,
-                        limit: int = 100, offset: int = 0) -> List[Order]:
-        """Get orders with filtering and pagination."""
+                        limit: int = 100,
+                        cursor_ts: Optional[datetime] = None,
+                        cursor_id: Optional[int] = None,
+                        account_names: Optional[List[str]] = None,
+                        connector_names: Optional[List[str]] = None,
+                        trading_pairs: Optional[List[str]] = None) -> List[Order]:
+        """
+        Get orders with filtering and keyset pagination.
+        Rows come in (created_at, id) DESC order, starting strictly after the (cursor_ts, cursor_id) position.
+        """
+        query = self._orders_query(account_name, connector_name, trading_pair, status, start_time, end_time,
+                                   cursor_ts, cursor_id, account_names, connector_names, trading_pairs)
+        query = query.limit(limit)
+        
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def count_orders(self, account_names: Optional[List[str]] = None,
+                           connector_names: Optional[List[str]] = None,
+                           trading_pairs: Optional[List[str]] = None,
+                           status: Optional[str] = None,
+                           start_time: Optional[int] = None,
+                           end_time: Optional[int] = None) -> int:
+        """Count the orders matching the same filters as get_orders, regardless of the page position."""
+        query = self._orders_query(None, None, None, status, start_time, end_time,
+                                   None, None, account_names, connector_names, trading_pairs)
+        result = await self.session.execute(query.with_only_columns(func.count(Order.id)).order_by(None))
+        return result.scalar_one()
+
+    async def iter_orders(self, account_names: Optional[List[str]] = None,
+                          connector_names: Optional[List[str]] = None,
+                          trading_pairs: Optional[List[str]] = None,
+                          status: Optional[str] = None,
+                          start_time: Optional[int] = None,
+                          end_time: Optional[int] = None,
+                          limit: Optional[int] = None,
+                          cursor_ts: Optional[datetime] = None,
+                          cursor_id: Optional[int] = None,
+                          batch_size: int = 100) -> AsyncIterator[Order]:
+        """
+        Stream orders in the same order and with the same filters as get_orders.
+        Rows are fetched from a server-side cursor in batches, so memory stays bounded regardless of the limit.
+        """
+        query = self._orders_query(None, None, None, status, start_time, end_time,
+                                   cursor_ts, cursor_id, account_names, connector_names, trading_pairs)
+        query = query.execution_options(yield_per=batch_size)
+        if limit:
+            query = query.limit(limit)
+
+        result = await self.session.stream_scalars(query)
+        async for order in result:
+            yield order
+
+    @staticmethod
+    def _orders_query(account_name: Optional[str], connector_name: Optional[str], trading_pair: Optional[str],
+                      status: Optional[str], start_time: Optional[int], end_time: Optional[int],
+                      cursor_ts: Optional[datetime], cursor_id: Optional[int],
+                      account_names: Optional[List[str]], connector_names: Optional[List[str]],
+                      trading_pairs: Optional[List[str]]):
+        """Build the filtered orders query in (created_at, id) DESC order, without a limit."""
         query = select(Order)
         
         # Apply filters
         if account_name:
             query = query.where(Order.account_name == account_name)
+        if account_names:
+            query = query.where(Order.account_name.in_(account_names))
         if connector_name:
             query = query.where(Order.connector_name == connector_name)
+        if connector_names:
+            query = query.where(Order.connector_name.in_(connector_names))
         if trading_pair:
             query = query.where(Order.trading_pair == trading_pair)
+        if trading_pairs:
+            query = query.where(Order.trading_pair.in_(trading_pairs))
         if status:
             query = query.where(Order.status == status)
         if start_time:
@@ -101,12 +165,10 @@ class OrderRepository:
             end_dt = datetime.fromtimestamp(end_time / 1000)
             query = query.where(Order.created_at <= end_dt)
         
-        # Apply ordering and pagination
-        query = query.order_by(Order.created_at.desc())
-        query = query.limit(limit).offset(offset)
+        if cursor_ts is not None and cursor_id is not None:
+            query = query.where(tuple_(Order.created_at, Order.id) < tuple_(cursor_ts, cursor_id))
         
-        result = await self.session.execute(query)
-        return result.scalars().all()
+        return query.order_by(Order.created_at.desc(), Order.id.desc())
 
     async def get_active_orders(self, account_name: Optional[str] = None,
                               connector_name: Optional[str] = None,
@@ -132,19 +194,26 @@ class OrderRepository:
     async def get_orders_summary(self, account_name: Optional[str] = None,
                                start_time: Optional[int] = None,
                                end_time: Optional[int] = None) -> Dict:
-        """Get order summary statistics."""
-        orders = await self.get_orders(
-            account_name=account_name,
-            start_time=start_time,
-            end_time=end_time,
-            limit=10000  # Get all for summary
-        )
+        """Get order summary statistics, counted per status in the database."""
+        query = select(Order.status, func.count()).group_by(Order.status)
+        
+        if account_name:
+            query = query.where(Order.account_name == account_name)
+        if start_time:
+            start_dt = datetime.fromtimestamp(start_time / 1000)
+            query = query.where(Order.created_at >= start_dt)
+        if end_time:
+            end_dt = datetime.fromtimestamp(end_time / 1000)
+            query = query.where(Order.created_at <= end_dt)
+        
+        result = await self.session.execute(query)
+        status_counts = dict(result.all())
         
-        total_orders = len(orders)
-        filled_orders = sum(1 for o in orders if o.status == "FILLED")
-        cancelled_orders = sum(1 for o in orders if o.status == "CANCELLED")
-        failed_orders = sum(1 for o in orders if o.status == "FAILED")
-        active_orders = sum(1 for o in orders if o.status in ["SUBMITTED", "OPEN", "PARTIALLY_FILLED"])
+        total_orders = sum(status_counts.values())
+        filled_orders = status_counts.get("FILLED", 0)
+        cancelled_orders = status_counts.get("CANCELLED", 0)
+        failed_orders = status_counts.get("FAILED", 0)
+        active_orders = sum(status_counts.get(s, 0) for s in ("SUBMITTED", "OPEN", "PARTIALLY_FILLED"))
         
         return {
             "total_orders": total_orders,
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from sqlalchemy import desc, select
+from sqlalchemy import desc, func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.models import Trade, Order
@@ -24,8 +24,10 @@ class TradeRepository:
                         trade_type: Optional[str] = None,
                         start_time: Optional[int] = None,
                         end_time: Optional[int] = None,
-                        limit: int = 100, offset: int = 0) -> List[Trade]:
-        """Get trades with filtering and pagination."""
+                        limit: int = 100,
+                        cursor_ts: Optional[datetime] = None,
+                        cursor_id: Optional[int] = None) -> List[Trade]:
+        """Get trades with filtering and keyset pagination in (timestamp, id) DESC order."""
         # Join trades with orders to get account information
         query = select(Trade).join(Order, Trade.order_id == Order.id)
         
@@ -45,9 +47,12 @@ class TradeRepository:
             end_dt = datetime.fromtimestamp(end_time / 1000)
             query = query.where(Trade.timestamp <= end_dt)
         
+        if cursor_ts is not None and cursor_id is not None:
+            query = query.where(tuple_(Trade.timestamp, Trade.id) < tuple_(cursor_ts, cursor_id))
+        
         # Apply ordering and pagination
-        query = query.order_by(Trade.timestamp.desc())
-        query = query.limit(limit).offset(offset)
+        query = query.order_by(Trade.timestamp.desc(), Trade.id.desc())
+        query = query.limit(limit)
         
         result = await self.session.execute(query)
         return result.scalars().all()
@@ -58,20 +63,89 @@ class TradeRepository:
                                    trade_type: Optional[str] = None,
                                    start_time: Optional[int] = None,
                                    end_time: Optional[int] = None,
-                                   limit: int = 100, offset: int = 0) -> List[tuple]:
-        """Get trades with their associated order information."""
+                                   limit: int = 100,
+                                   cursor_ts: Optional[datetime] = None,
+                                   cursor_id: Optional[int] = None,
+                                   account_names: Optional[List[str]] = None,
+                                   connector_names: Optional[List[str]] = None,
+                                   trading_pairs: Optional[List[str]] = None,
+                                   trade_types: Optional[List[str]] = None) -> List[tuple]:
+        """
+        Get trades with their associated order information.
+        Rows come in (timestamp, id) DESC order, starting strictly after the (cursor_ts, cursor_id) position.
+        """
+        query = self._trades_with_orders_query(account_name, connector_name, trading_pair, trade_type,
+                                               start_time, end_time, cursor_ts, cursor_id,
+                                               account_names, connector_names, trading_pairs, trade_types)
+        query = query.limit(limit)
+        
+        result = await self.session.execute(query)
+        return result.all()  # Returns tuples of (Trade, Order)
+
+    async def count_trades_with_orders(self, account_names: Optional[List[str]] = None,
+                                       connector_names: Optional[List[str]] = None,
+                                       trading_pairs: Optional[List[str]] = None,
+                                       trade_types: Optional[List[str]] = None,
+                                       start_time: Optional[int] = None,
+                                       end_time: Optional[int] = None) -> int:
+        """Count the trades matching the same filters as get_trades_with_orders, regardless of the page position."""
+        query = self._trades_with_orders_query(None, None, None, None, start_time, end_time, None, None,
+                                               account_names, connector_names, trading_pairs, trade_types)
+        result = await self.session.execute(query.with_only_columns(func.count(Trade.id)).order_by(None))
+        return result.scalar_one()
+
+    async def iter_trades_with_orders(self, account_names: Optional[List[str]] = None,
+                                      connector_names: Optional[List[str]] = None,
+                                      trading_pairs: Optional[List[str]] = None,
+                                      trade_types: Optional[List[str]] = None,
+                                      start_time: Optional[int] = None,
+                                      end_time: Optional[int] = None,
+                                      limit: Optional[int] = None,
+                                      cursor_ts: Optional[datetime] = None,
+                                      cursor_id: Optional[int] = None,
+                                      batch_size: int = 100) -> AsyncIterator[Tuple[Trade, Order]]:
+        """
+        Stream (Trade, Order) rows in the same order and with the same filters as get_trades_with_orders.
+        Rows are fetched from a server-side cursor in batches, so memory stays bounded regardless of the limit.
+        """
+        query = self._trades_with_orders_query(None, None, None, None, start_time, end_time, cursor_ts, cursor_id,
+                                               account_names, connector_names, trading_pairs, trade_types)
+        query = query.execution_options(yield_per=batch_size)
+        if limit:
+            query = query.limit(limit)
+
+        result = await self.session.stream(query)
+        async for trade, order in result:
+            yield trade, order
+
+    @staticmethod
+    def _trades_with_orders_query(account_name: Optional[str], connector_name: Optional[str],
+                                  trading_pair: Optional[str], trade_type: Optional[str],
+                                  start_time: Optional[int], end_time: Optional[int],
+                                  cursor_ts: Optional[datetime], cursor_id: Optional[int],
+                                  account_names: Optional[List[str]], connector_names: Optional[List[str]],
+                                  trading_pairs: Optional[List[str]], trade_types: Optional[List[str]]):
+        """Build the filtered (Trade, Order) query in (timestamp, id) DESC order, without a limit."""
         # Join trades with orders to get complete information
         query = select(Trade, Order).join(Order, Trade.order_id == Order.id)
         
         # Apply filters
         if account_name:
             query = query.where(Order.account_name == account_name)
+        if account_names:
+            query = query.where(Order.account_name.in_(account_names))
         if connector_name:
             query = query.where(Order.connector_name == connector_name)
+        if connector_names:
+            query = query.where(Order.connector_name.in_(connector_names))
         if trading_pair:
             query = query.where(Trade.trading_pair == trading_pair)
+        if trading_pairs:
+            query = query.where(Trade.trading_pair.in_(trading_pairs))
         if trade_type:
             query = query.where(Trade.trade_type == trade_type)
+        if trade_types:
+            query = query.where(Trade.trade_type.in_(trade_types))
         if start_time:
             start_dt = datetime.fromtimestamp(start_time / 1000)
             query = query.where(Trade.timestamp >= start_dt)
@@ -79,12 +153,10 @@ class TradeRepository:
             end_dt = datetime.fromtimestamp(end_time / 1000)
             query = query.where(Trade.timestamp <= end_dt)
         
-        # Apply ordering and pagination
-        query = query.order_by(Trade.timestamp.desc())
-        query = query.limit(limit).offset(offset)
+        if cursor_ts is not None and cursor_id is not None:
+            query = query.where(tuple_(Trade.timestamp, Trade.id) < tuple_(cursor_ts, cursor_id))
         
-        result = await self.session.execute(query)
-        return result.all()  # Returns tuples of (Trade, Order)
+        return query.order_by(Trade.timestamp.desc(), Trade.id.desc())
 
     def to_dict(self, trade: Trade, order: Optional[Order] = None) -> Dict:
         """Convert Trade model to dictionary format."""
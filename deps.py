@@ -1,37 +1,63 @@
-from fastapi import Request
+import asyncio
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request
 from services.bots_orchestrator import BotsOrchestrator
 from services.accounts_service import AccountsService
 from services.docker_service import DockerService
 from services.market_data_feed_manager import MarketDataFeedManager
 from utils.bot_archiver import BotArchiver
 from database import AsyncDatabaseManager
+from config import settings
+from models import AccountName
+
+# Bounds concurrent history/funding scans so they cannot starve the cheap realtime endpoints
+history_semaphore = asyncio.Semaphore(settings.database.history_concurrency)
+# NDJSON streams hold their slot until the client has read everything, so they get their own slots and can never
+# pin the ones the paginated scans share
+history_stream_semaphore = asyncio.Semaphore(settings.database.history_stream_concurrency)
 
 
-def get_bots_orchestrator(request: Request) -> BotsOrchestrator:
+# App-state getters are async so FastAPI resolves them on the event loop instead of dispatching to the threadpool
+async def get_bots_orchestrator(request: Request) -> BotsOrchestrator:
     """Get BotsOrchestrator service from app state."""
     return request.app.state.bots_orchestrator
 
 
-def get_accounts_service(request: Request) -> AccountsService:
+async def get_accounts_service(request: Request) -> AccountsService:
     """Get AccountsService from app state."""
     return request.app.state.accounts_service
 
 
-def get_docker_service(request: Request) -> DockerService:
+# Reusable annotated dependency so routes share a single resolved dependency declaration
+AccountsDep = Annotated[AccountsService, Depends(get_accounts_service)]
+
+
+async def get_valid_account(account_name: AccountName, accounts_service: AccountsDep) -> str:
+    """Validate the account_name path parameter against the cached account set, 404 before the handler runs."""
+    if not accounts_service.account_exists(account_name):
+        raise HTTPException(status_code=404, detail=f"Account '{account_name}' not found")
+    return account_name
+
+
+ValidAccountDep = Annotated[str, Depends(get_valid_account)]
+
+
+async def get_docker_service(request: Request) -> DockerService:
     """Get DockerService from app state."""
     return request.app.state.docker_service
 
 
-def get_market_data_feed_manager(request: Request) -> MarketDataFeedManager:
+async def get_market_data_feed_manager(request: Request) -> MarketDataFeedManager:
     """Get MarketDataFeedManager from app state."""
     return request.app.state.market_data_feed_manager
 
 
-def get_bot_archiver(request: Request) -> BotArchiver:
+async def get_bot_archiver(request: Request) -> BotArchiver:
     """Get BotArchiver from app state."""
     return request.app.state.bot_archiver
 
 
-def get_database_manager(request: Request) -> AsyncDatabaseManager:
+async def get_database_manager(request: Request) -> AsyncDatabaseManager:
     """Get AsyncDatabaseManager from app state."""
     return request.app.state.accounts_service.db_manager
\ No newline at end of file
@@ -107,7 +107,8 @@ async def lifespan(app: FastAPI):
 
     accounts_service = AccountsService(
         account_update_interval=settings.app.account_update_interval,
-        market_data_feed_manager=market_data_feed_manager
+        market_data_feed_manager=market_data_feed_manager,
+        state_refresh_ttl=settings.app.state_refresh_ttl
     )
     docker_service = DockerService()
     bot_archiver = BotArchiver(
@@ -143,6 +144,9 @@ async def lifespan(app: FastAPI):
     # Clean up docker service
     docker_service.cleanup()
 
+    # Stop the backtesting worker processes
+    backtesting.shutdown_backtesting_pool()
+
     # Close database connections
     await accounts_service.db_manager.close()
 
@@ -190,10 +194,11 @@ def auth_user(
     return credentials.username
 
 # Include all routers with authentication
+# The most polled routers (portfolio state, connectors) go first since Starlette matches routes in order
+app.include_router(portfolio.router, dependencies=[Depends(auth_user)])
+app.include_router(connectors.router, dependencies=[Depends(auth_user)])
 app.include_router(docker.router, dependencies=[Depends(auth_user)])
 app.include_router(accounts.router, dependencies=[Depends(auth_user)])
-app.include_router(connectors.router, dependencies=[Depends(auth_user)])
-app.include_router(portfolio.router, dependencies=[Depends(auth_user)])
 app.include_router(trading.router, dependencies=[Depends(auth_user)])
 app.include_router(bot_orchestration.router, dependencies=[Depends(auth_user)])
 app.include_router(controllers.router, dependencies=[Depends(auth_user)])
@@ -92,6 +92,7 @@ from .market_data import (
 
 # Account models
 from .accounts import (
+    AccountName,
     LeverageRequest,
     PositionModeRequest,
     CredentialRequest,
@@ -218,6 +219,7 @@ __all__ = [
     "VWAPForVolumeRequest",
     "OrderBookQueryResult",
     # Account models
+    "AccountName",
     "LeverageRequest",
     "PositionModeRequest",
     "CredentialRequest",
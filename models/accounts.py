@@ -1,5 +1,9 @@
-from pydantic import BaseModel, Field
-from typing import Dict, Any
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, Dict, Any
+
+
+# Account names map to credential folders, so only allow a safe, bounded character set
+AccountName = Annotated[str, StringConstraints(pattern=r"^[A-Za-z0-9_-]{1,64}$")]
 
 
 class LeverageRequest(BaseModel):
@@ -1,30 +1,45 @@
-from typing import Dict, List, Optional
+from typing import Annotated, Dict, List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+import orjson
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
 from starlette import status
 
-from services.accounts_service import AccountsService
-from deps import get_accounts_service
-from models import PaginatedResponse
+from deps import AccountsDep, ValidAccountDep
+from models import AccountName, PaginatedResponse
+from services.accounts_service import PROTECTED_ACCOUNTS, protected_account_error
 
-router = APIRouter(tags=["Accounts"], prefix="/accounts")
+router = APIRouter(tags=["Accounts"], prefix="/accounts", default_response_class=ORJSONResponse)
 
+# Fixed success bodies are serialized once. A new Response is still built per request because FastAPI attaches
+# the request's background tasks to the returned instance, so a shared instance would leak them across requests.
+_ACCOUNT_ADDED = orjson.dumps({"message": "Account added successfully."})
+_ACCOUNT_DELETED = orjson.dumps({"message": "Account deleted successfully."})
+_CREDENTIAL_DELETED = orjson.dumps({"message": "Credential deleted successfully."})
+_CREDENTIALS_ADDED = orjson.dumps({"message": "Connector credentials added successfully."})
 
-@router.get("/", response_model=List[str])
-async def list_accounts(accounts_service: AccountsService = Depends(get_accounts_service)):
+
+def _message_response(body: bytes, status_code: int = status.HTTP_200_OK) -> Response:
+    """Wrap a pre-serialized JSON message body in a response."""
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+@router.get("/")
+async def list_accounts(accounts_service: AccountsDep):
     """
     Get a list of all account names in the system.
     
     Returns:
         List of account names
     """
-    return accounts_service.list_accounts()
+    # The service already returns plain strings, so skip response_model validation and encode directly
+    return ORJSONResponse(content=accounts_service.list_accounts())
 
 
 @router.get("/{account_name}/credentials", response_model=List[str])
-async def list_account_credentials(account_name: str,
-                                   accounts_service: AccountsService = Depends(get_accounts_service)):
+async def list_account_credentials(account_name: ValidAccountDep,
+                                   accounts_service: AccountsDep):
     """
     Get a list of all connectors that have credentials configured for a specific account.
 
@@ -38,9 +53,7 @@ async def list_account_credentials(account_name: str,
         HTTPException: 404 if account not found
     """
     try:
-        credentials = accounts_service.list_credentials(account_name)
-        # Remove .yml extension from filenames
-        return [cred.replace('.yml', '') for cred in credentials]
+        return accounts_service.list_credentials(account_name)
     except HTTPException:
         raise
     except Exception as e:
@@ -48,7 +61,7 @@ async def list_account_credentials(account_name: str,
 
 
 @router.post("/add-account", status_code=status.HTTP_201_CREATED)
-async def add_account(account_name: str, accounts_service: AccountsService = Depends(get_accounts_service)):
+async def add_account(account_name: AccountName, accounts_service: AccountsDep):
     """
     Create a new account with default configuration files.
     
@@ -59,17 +72,35 @@ async def add_account(account_name: str, accounts_service: AccountsService = Dep
         Success message when account is created
         
     Raises:
-        HTTPException: 400 if account already exists
+        HTTPException: 400 if account already exists, 422 if the name has invalid characters or length
     """
     try:
-        accounts_service.add_account(account_name)
-        return {"message": "Account added successfully."}
+        await accounts_service.add_account(account_name)
+        return _message_response(_ACCOUNT_ADDED, status.HTTP_201_CREATED)
     except FileExistsError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+async def _reject_master(account_name: AccountName) -> str:
+    """
+    Reject requests targeting a protected account before any other dependency is resolved.
+    
+    Args:
+        account_name: Name of the account from the request
+        
+    Returns:
+        The account name if it is not a protected account
+        
+    Raises:
+        HTTPException: 400 if the account is a protected account
+    """
+    if account_name in PROTECTED_ACCOUNTS:
+        raise protected_account_error(account_name)
+    return account_name
+
+
 @router.post("/delete-account")
-async def delete_account(account_name: str, accounts_service: AccountsService = Depends(get_accounts_service)):
+async def delete_account(account_name: Annotated[str, Depends(_reject_master)], accounts_service: AccountsDep):
     """
     Delete an account and all its associated credentials.
     
@@ -83,16 +114,14 @@ async def delete_account(account_name: str, accounts_service: AccountsService =
         HTTPException: 400 if trying to delete master account, 404 if account not found
     """
     try:
-        if account_name == "master_account":
-            raise HTTPException(status_code=400, detail="Cannot delete master account.")
         await accounts_service.delete_account(account_name)
-        return {"message": "Account deleted successfully."}
+        return _message_response(_ACCOUNT_DELETED)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.post("/delete-credential/{account_name}/{connector_name}")
-async def delete_credential(account_name: str, connector_name: str, accounts_service: AccountsService = Depends(get_accounts_service)):
+async def delete_credential(account_name: ValidAccountDep, connector_name: str, accounts_service: AccountsDep):
     """
     Delete a specific connector credential for an account.
     
@@ -104,17 +133,18 @@ async def delete_credential(account_name: str, connector_name: str, accounts_ser
         Success message when credential is deleted
         
     Raises:
-        HTTPException: 404 if credential not found
+        HTTPException: 404 if account or credential not found
     """
     try:
         await accounts_service.delete_credentials(account_name, connector_name)
-        return {"message": "Credential deleted successfully."}
+        return _message_response(_CREDENTIAL_DELETED)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.post("/add-credential/{account_name}/{connector_name}", status_code=status.HTTP_201_CREATED)
-async def add_credential(account_name: str, connector_name: str, credentials: Dict, accounts_service: AccountsService = Depends(get_accounts_service)):
+async def add_credential(account_name: ValidAccountDep, connector_name: str, credentials: Dict, accounts_service: AccountsDep,
+                         background_tasks: BackgroundTasks):
     """
     Add or update connector credentials (API keys) for a specific account and connector.
     
@@ -124,14 +154,17 @@ async def add_credential(account_name: str, connector_name: str, credentials: Di
         credentials: Dictionary containing the connector credentials
         
     Returns:
-        Success message when credentials are added
-        
-    Raises:
-        HTTPException: 400 if there's an error adding the credentials
+        Success message when credentials are added, or a 400 error response if there's an error adding
+        the credentials. Credentials created by a failed request are removed in the background.
     """
+    credentials_existed = accounts_service.credentials_exist(account_name, connector_name)
     try:
         await accounts_service.add_credentials(account_name, connector_name, credentials)
-        return {"message": "Connector credentials added successfully."}
+        return _message_response(_CREDENTIALS_ADDED, status.HTTP_201_CREATED)
     except Exception as e:
-        await accounts_service.delete_credentials(account_name, connector_name)
-        raise HTTPException(status_code=400, detail=str(e))
+        # Only roll back a credentials file written by this request, never previously configured keys
+        if not credentials_existed and accounts_service.credentials_exist(account_name, connector_name):
+            background_tasks.add_task(accounts_service.delete_credentials, account_name, connector_name)
+        # Background tasks only run with a returned response, so the error is returned instead of raised
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(e)},
+                            background=background_tasks)
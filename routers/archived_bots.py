@@ -1,10 +1,133 @@
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+import os
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+import orjson
+import pandas as pd
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from utils.file_system import fs_util
 from utils.hummingbot_database_reader import HummingbotDatabase
 
-router = APIRouter(tags=["Archived Bots"], prefix="/archived-bots")
+router = APIRouter(tags=["Archived Bots"], prefix="/archived-bots", default_response_class=ORJSONResponse)
+
+
+# Database readers shared across requests, least recently used first. Each one owns an SQLAlchemy engine
+_DB_POOL_SIZE = 16
+_db_pool: "OrderedDict[str, HummingbotDatabase]" = OrderedDict()
+
+
+@lru_cache(maxsize=1)
+def _list_databases(archived_mtime: float) -> Tuple[str, ...]:
+    """List the archived databases once per version of the archive folder."""
+    return tuple(fs_util.list_databases())
+
+
+def _archived_databases() -> Tuple[str, ...]:
+    """
+    Get the archived database paths, rescanning only when the archive folder changes.
+    Bots are archived by moving their whole instance folder in, which updates the archive folder modification time.
+    """
+    try:
+        archived_mtime = os.stat(os.path.join(fs_util.base_path, "archived")).st_mtime
+    except FileNotFoundError:
+        archived_mtime = 0.0
+    return _list_databases(archived_mtime)
+
+
+# Rows encoded per chunk when streaming DataFrame records, bounding the size of each encoded piece
+_RECORDS_CHUNK_SIZE = 1000
+
+
+def _records_response(db_path: str, key: str, records: pd.DataFrame, **fields) -> StreamingResponse:
+    """
+    Stream a JSON response around DataFrame rows serialized by pandas in C, so no per-row dicts are built and
+    only one chunk of encoded rows is held at a time.
+    :param db_path: Database path echoed in the response.
+    :param key: Name of the field holding the rows.
+    :param records: Rows to return, missing values are sent as 0.
+    :param fields: Additional JSON-native fields appended to the response.
+    :return: The streaming JSON response.
+    """
+    records = records.fillna(0)
+
+    def body_chunks():
+        yield b'{"db_path":' + orjson.dumps(db_path) + b',"' + key.encode() + b'":['
+        separator = b""
+        for start in range(0, len(records), _RECORDS_CHUNK_SIZE):
+            chunk = records.iloc[start:start + _RECORDS_CHUNK_SIZE].to_json(orient="records", double_precision=15)
+            # Strip the enclosing brackets so consecutive chunks form a single array
+            yield separator + chunk[1:-1].encode()
+            separator = b","
+        tail = b"]"
+        for name, value in fields.items():
+            tail += b',"' + name.encode() + b'":' + orjson.dumps(value)
+        yield tail + b"}"
+
+    return StreamingResponse(body_chunks(), media_type="application/json")
+
+
+def _db_etag(db_path: str) -> str:
+    """Build a weak ETag from a database file version, so unchanged files are revalidated without reading them."""
+    stat = os.stat(db_path)
+    return f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def _get_db(db_path: str) -> HummingbotDatabase:
+    """
+    Get the shared database reader for a database file, so its engine and connection pool are reused.
+    Readers query the file live, so one reader per path stays valid while the bot keeps writing to it.
+    The least recently used reader is evicted and its engine disposed once more than _DB_POOL_SIZE are open.
+    """
+    # Stat first so a missing path fails instead of having SQLite create an empty file
+    os.stat(db_path)
+    db = _db_pool.get(db_path)
+    if db is None:
+        db = _db_pool[db_path] = HummingbotDatabase(db_path)
+        if len(_db_pool) > _DB_POOL_SIZE:
+            _, evicted = _db_pool.popitem(last=False)
+            evicted.engine.dispose()
+    else:
+        _db_pool.move_to_end(db_path)
+    return db
+
+
+# Computed summary and performance results, least recently used first, keyed by (db_path, endpoint)
+_RESULT_CACHE_SIZE = 32
+_result_cache: "OrderedDict[Tuple[str, str], Tuple[str, asyncio.Future]]" = OrderedDict()
+
+
+async def _cached_result(db_path: str, version: str, endpoint: str, compute: Callable, *args):
+    """
+    Run a blocking computation over a database in a worker thread, once per version of the database file.
+    Concurrent requests for the same result share the running computation, failures are not cached.
+    :param db_path: Path of the database the result is computed from.
+    :param version: Version of the database file, as returned by _db_etag.
+    :param endpoint: Name of the result, so several results of the same database are cached side by side.
+    :param compute: The blocking function computing the result.
+    :param args: Arguments passed to compute.
+    :return: The computed result.
+    """
+    key = (db_path, endpoint)
+    entry = _result_cache.get(key)
+    if entry is not None and entry[0] == version:
+        future = entry[1]
+        _result_cache.move_to_end(key)
+    else:
+        future = asyncio.ensure_future(asyncio.to_thread(compute, *args))
+        _result_cache[key] = (version, future)
+        if len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+    try:
+        # Shielded so a disconnecting client does not cancel the computation other requests are waiting on
+        return await asyncio.shield(future)
+    except Exception:
+        if _result_cache.get(key, (None, None))[1] is future:
+            del _result_cache[key]
+        raise
 
 
 @router.get("/", response_model=List[str])
@@ -15,11 +138,12 @@ async def list_databases():
     Returns:
         List of database file paths
     """
-    return fs_util.list_databases()
+    # Scanning every archived instance folder is blocking I/O, keep it off the event loop
+    return list(await asyncio.to_thread(_archived_databases))
 
 
 @router.get("/{db_path:path}/status")
-async def get_database_status(db_path: str):
+async def get_database_status(db_path: str, request: Request):
     """
     Get status information for a specific database.
     
@@ -27,21 +151,27 @@ async def get_database_status(db_path: str):
         db_path: Path to the database file
         
     Returns:
-        Database status including table health
+        Database status including table health,
+        or 304 Not Modified if the If-None-Match header matches the database file ETag
     """
     try:
-        db = HummingbotDatabase(db_path)
-        return {
+        etag = _db_etag(db_path)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        db = _get_db(db_path)
+        # The status property loads every table, so evaluate it once and off the event loop
+        db_status = await asyncio.to_thread(lambda: db.status)
+        return ORJSONResponse(content={
             "db_path": db_path,
-            "status": db.status,
-            "healthy": db.status["general_status"]
-        }
+            "status": db_status,
+            "healthy": db_status["general_status"]
+        }, headers={"ETag": etag})
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Database not found or error: {str(e)}")
 
 
 @router.get("/{db_path:path}/summary")
-async def get_database_summary(db_path: str):
+async def get_database_summary(db_path: str, request: Request):
     """
     Get a summary of database contents including basic statistics.
     
@@ -49,32 +179,49 @@ async def get_database_summary(db_path: str):
         db_path: Full path to the database file
         
     Returns:
-        Summary statistics of the database contents
+        Summary statistics of the database contents,
+        or 304 Not Modified if the If-None-Match header matches the database file ETag
     """
     try:
-        db = HummingbotDatabase(db_path)
+        etag = _db_etag(db_path)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        db = _get_db(db_path)
         
-        # Get basic counts
-        orders = db.get_orders()
-        trades = db.get_trade_fills()
-        executors = db.get_executors_data()
-        positions = db.get_positions()
-        controllers = db.get_controllers_data()
-        
-        return {
-            "db_path": db_path,
-            "total_orders": len(orders),
-            "total_trades": len(trades),
-            "total_executors": len(executors),
-            "total_positions": len(positions),
-            "total_controllers": len(controllers),
-            "trading_pairs": orders["trading_pair"].unique().tolist() if len(orders) > 0 else [],
-            "exchanges": orders["connector_name"].unique().tolist() if len(orders) > 0 else [],
-        }
+        # Counts and distinct values are computed by SQLite off the event loop, once per file version
+        summary = await _cached_result(db_path, etag, "summary", db.summary_counts)
+        return ORJSONResponse(content={"db_path": db_path, **summary}, headers={"ETag": etag})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing database: {str(e)}")
 
 
+def _compute_performance(db: HummingbotDatabase) -> Tuple[pd.DataFrame, Optional[Dict]]:
+    """
+    Run the trade-based performance calculation of a database and summarize it.
+    :param db: The database reader.
+    :return: Tuple of (performance rows, summary statistics), the summary is None if there are no trades.
+    """
+    # Use new trade-based performance calculation
+    performance_data = db.calculate_trade_based_performance()
+    if len(performance_data) == 0:
+        return performance_data, None
+    
+    # Calculate summary statistics
+    final_row = performance_data.iloc[-1]
+    summary = {
+        "total_trades": len(performance_data),
+        "final_net_pnl_quote": float(final_row.get('net_pnl_quote', 0)),
+        "final_realized_pnl_quote": float(final_row.get('realized_trade_pnl_quote', 0)), 
+        "final_unrealized_pnl_quote": float(final_row.get('unrealized_trade_pnl_quote', 0)),
+        "total_fees_quote": float(performance_data['fees_quote'].sum()),
+        "total_volume_quote": float(performance_data['cum_volume_quote'].iloc[-1]),
+        "final_net_position": float(final_row.get('net_position', 0)),
+        "trading_pairs": performance_data['trading_pair'].unique().tolist(),
+        "connector_names": performance_data['connector_name'].unique().tolist()
+    }
+    return performance_data, summary
+
+
 @router.get("/{db_path:path}/performance")
 async def get_database_performance(db_path: str):
     """
@@ -87,40 +234,21 @@ async def get_database_performance(db_path: str):
         Trade-based performance metrics with rolling calculations
     """
     try:
-        db = HummingbotDatabase(db_path)
+        db = _get_db(db_path)
         
-        # Use new trade-based performance calculation
-        performance_data = db.calculate_trade_based_performance()
+        # The performance calculation is CPU-bound pandas work, run it in a worker thread once per file version
+        performance_data, summary = await _cached_result(
+            db_path, _db_etag(db_path), "performance", _compute_performance, db
+        )
         
-        if len(performance_data) == 0:
+        if summary is None:
             return {
                 "db_path": db_path,
                 "error": "No trades found in database",
                 "performance_data": []
             }
         
-        # Convert to records for JSON response
-        performance_records = performance_data.fillna(0).to_dict('records')
-        
-        # Calculate summary statistics
-        final_row = performance_data.iloc[-1] if len(performance_data) > 0 else {}
-        summary = {
-            "total_trades": len(performance_data),
-            "final_net_pnl_quote": float(final_row.get('net_pnl_quote', 0)),
-            "final_realized_pnl_quote": float(final_row.get('realized_trade_pnl_quote', 0)), 
-            "final_unrealized_pnl_quote": float(final_row.get('unrealized_trade_pnl_quote', 0)),
-            "total_fees_quote": float(performance_data['fees_quote'].sum()),
-            "total_volume_quote": float(performance_data['cum_volume_quote'].iloc[-1] if len(performance_data) > 0 else 0),
-            "final_net_position": float(final_row.get('net_position', 0)),
-            "trading_pairs": performance_data['trading_pair'].unique().tolist(),
-            "connector_names": performance_data['connector_name'].unique().tolist()
-        }
-        
-        return {
-            "db_path": db_path,
-            "summary": summary,
-            "performance_data": performance_records
-        }
+        return _records_response(db_path, "performance_data", performance_data, summary=summary)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error calculating performance: {str(e)}")
@@ -144,23 +272,18 @@ async def get_database_trades(
         List of trades with pagination info
     """
     try:
-        db = HummingbotDatabase(db_path)
-        trades = db.get_trade_fills()
+        db = _get_db(db_path)
         
-        # Apply pagination
-        total_trades = len(trades)
-        trades_page = trades.iloc[offset:offset + limit]
+        # Pagination is applied in SQLite so only the requested page is loaded
+        trades_page = db.get_trade_fills(limit=limit, offset=offset)
+        total_trades = db.get_trade_fills_count()
         
-        return {
-            "db_path": db_path,
-            "trades": trades_page.fillna(0).to_dict('records'),
-            "pagination": {
-                "total": total_trades,
-                "limit": limit,
-                "offset": offset,
-                "has_more": offset + limit < total_trades
-            }
-        }
+        return _records_response(db_path, "trades", trades_page, pagination={
+            "total": total_trades,
+            "limit": limit,
+            "offset": offset,
+            "has_more": offset + limit < total_trades
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching trades: {str(e)}")
 
@@ -185,51 +308,50 @@ async def get_database_orders(
         List of orders with pagination info
     """
     try:
-        db = HummingbotDatabase(db_path)
-        orders = db.get_orders()
+        db = _get_db(db_path)
         
-        # Apply status filter if provided
-        if status:
-            orders = orders[orders["last_status"] == status]
+        # The status filter and pagination are applied in SQLite so only the requested page is loaded
+        orders_page = db.get_orders(limit=limit, offset=offset, status=status)
+        total_orders = db.get_orders_count(status=status)
         
-        # Apply pagination
-        total_orders = len(orders)
-        orders_page = orders.iloc[offset:offset + limit]
-        
-        return {
-            "db_path": db_path,
-            "orders": orders_page.fillna(0).to_dict('records'),
-            "pagination": {
-                "total": total_orders,
-                "limit": limit,
-                "offset": offset,
-                "has_more": offset + limit < total_orders
-            }
-        }
+        return _records_response(db_path, "orders", orders_page, pagination={
+            "total": total_orders,
+            "limit": limit,
+            "offset": offset,
+            "has_more": offset + limit < total_orders
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching orders: {str(e)}")
 
 
 @router.get("/{db_path:path}/executors")
-async def get_database_executors(db_path: str):
+async def get_database_executors(
+    db_path: str,
+    limit: int = Query(default=500, le=5000, description="Limit number of executors returned"),
+    offset: int = Query(default=0, description="Offset for pagination")
+):
     """
     Get executor data from a database.
     
     Args:
         db_path: Full path to the database file
+        limit: Maximum number of executors to return
+        offset: Offset for pagination
         
     Returns:
-        List of executors with their configurations and results
+        List of executors with their configurations and results, with pagination info
     """
     try:
-        db = HummingbotDatabase(db_path)
-        executors = db.get_executors_data()
+        db = _get_db(db_path)
+        executors_page = db.get_executors_data(limit=limit, offset=offset)
+        total_executors = db.get_executors_count()
         
-        return {
-            "db_path": db_path,
-            "executors": executors.fillna(0).to_dict('records'),
-            "total": len(executors)
-        }
+        return _records_response(db_path, "executors", executors_page, pagination={
+            "total": total_executors,
+            "limit": limit,
+            "offset": offset,
+            "has_more": offset + limit < total_executors
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching executors: {str(e)}")
 
@@ -252,23 +374,16 @@ async def get_database_positions(
         List of positions with pagination info
     """
     try:
-        db = HummingbotDatabase(db_path)
-        positions = db.get_positions()
-        
-        # Apply pagination
-        total_positions = len(positions)
-        positions_page = positions.iloc[offset:offset + limit]
+        db = _get_db(db_path)
+        positions_page = db.get_positions(limit=limit, offset=offset)
+        total_positions = db.get_positions_count()
         
-        return {
-            "db_path": db_path,
-            "positions": positions_page.fillna(0).to_dict('records'),
-            "pagination": {
-                "total": total_positions,
-                "limit": limit,
-                "offset": offset,
-                "has_more": offset + limit < total_positions
-            }
-        }
+        return _records_response(db_path, "positions", positions_page, pagination={
+            "total": total_positions,
+            "limit": limit,
+            "offset": offset,
+            "has_more": offset + limit < total_positions
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching positions: {str(e)}")
 
@@ -285,13 +400,9 @@ async def get_database_controllers(db_path: str):
         List of controllers that were running with their configurations
     """
     try:
-        db = HummingbotDatabase(db_path)
+        db = _get_db(db_path)
         controllers = db.get_controllers_data()
         
-        return {
-            "db_path": db_path,
-            "controllers": controllers.fillna(0).to_dict('records'),
-            "total": len(controllers)
-        }
+        return _records_response(db_path, "controllers", controllers, total=len(controllers))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching controllers: {str(e)}")
@@ -1,13 +1,107 @@
-from fastapi import APIRouter
-from hummingbot.data_feed.candles_feed.candles_factory import CandlesFactory
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+import orjson
+from fastapi import APIRouter, Response
+from fastapi.encoders import jsonable_encoder
 from hummingbot.strategy_v2.backtesting.backtesting_engine_base import BacktestingEngineBase
 
 from config import settings
 from models.backtesting import BacktestingConfig
+from utils.candles_cache import CachedBacktestingDataProvider
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Backtesting"], prefix="/backtesting")
-candles_factory = CandlesFactory()
 backtesting_engine = BacktestingEngineBase()
+# Candles are kept on disk so backtests in every worker process reuse them across runs and restarts
+backtesting_engine.backtesting_data_provider = CachedBacktestingDataProvider(
+    cache_path=settings.app.candles_cache_path, connectors={}
+)
+
+
+# Backtests run in spawned worker processes, one at a time per process, so they use separate cores instead of
+# sharing the API's GIL. Each worker imports this module and keeps its own engine between jobs
+def _new_backtesting_pool() -> ProcessPoolExecutor:
+    """Create the worker pool backtests are submitted to."""
+    return ProcessPoolExecutor(
+        max_workers=max(1, (os.cpu_count() or 2) // 2), mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+_backtesting_pool = _new_backtesting_pool()
+
+
+def shutdown_backtesting_pool():
+    """Stop the backtesting worker processes, cancelling queued jobs. Called on application shutdown."""
+    _backtesting_pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _submit_backtesting_job(*args) -> bytes:
+    """
+    Run a backtesting job in the worker pool.
+    A worker that dies (for example killed for memory) breaks the whole pool, failing every later submit, so a
+    broken pool is replaced and the job retried once on the fresh pool before the failure is reported.
+    :param args: Arguments of _run_backtesting_job.
+    :return: The JSON response body.
+    """
+    global _backtesting_pool
+    for attempt in range(2):
+        pool = _backtesting_pool
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, _run_backtesting_job, *args)
+        except BrokenProcessPool:
+            # Concurrent jobs fail together, so only the first one to notice replaces the pool
+            if _backtesting_pool is pool:
+                logger.warning("Backtesting worker pool is broken, starting a new one")
+                pool.shutdown(wait=False, cancel_futures=True)
+                _backtesting_pool = _new_backtesting_pool()
+            if attempt:
+                raise
+
+
+def _run_backtesting_job(controller_config, trade_cost: float, start: int, end: int,
+                         backtesting_resolution: str) -> bytes:
+    """
+    Run a backtest inside a worker process and serialize its results there.
+    Only the JSON body travels back to the API process, so executors and DataFrames are never pickled.
+    :param controller_config: The controller config instance to backtest.
+    :param trade_cost: Trading cost applied to every fill.
+    :param start: Start of the backtest, in seconds.
+    :param end: End of the backtest, in seconds.
+    :param backtesting_resolution: Candle interval of the simulation.
+    :return: The JSON response body.
+    """
+    backtesting_results = asyncio.run(backtesting_engine.run_backtesting(
+        controller_config=controller_config, trade_cost=trade_cost,
+        start=start, end=end, backtesting_resolution=backtesting_resolution))
+    # The features frame is the bulk of the response, so pandas serializes it in C rather than building a
+    # nested dict that FastAPI would walk again. Executors and results hold Decimals and enums and go
+    # through jsonable_encoder as before
+    processed_data = backtesting_results["processed_data"]["features"].fillna(0)
+    executors_info = [e.to_dict() for e in backtesting_results["executors"]]
+    results = backtesting_results["results"]
+    results["sharpe_ratio"] = results["sharpe_ratio"] if results["sharpe_ratio"] is not None else 0
+    return (
+        b'{"executors":' + orjson.dumps(jsonable_encoder(executors_info))
+        + b',"processed_data":' + processed_data.to_json(date_format="iso", double_precision=15).encode()
+        + b',"results":' + orjson.dumps(jsonable_encoder(results)) + b"}"
+    )
+
+
+@lru_cache(maxsize=128)
+def _load_controller_config(config_path: str, mtime: float):
+    """Parse a controller YAML config once per file version, so parameter sweeps over one file skip the parse."""
+    return backtesting_engine.get_controller_config_instance_from_yml(
+        config_path=config_path,
+        controllers_conf_dir_path=settings.app.controllers_path,
+        controllers_module=settings.app.controllers_module
+    )
 
 
 @router.post("/run-backtesting")
@@ -27,29 +121,20 @@ async def run_backtesting(backtesting_config: BacktestingConfig):
     """
     try:
         if isinstance(backtesting_config.config, str):
-            controller_config = backtesting_engine.get_controller_config_instance_from_yml(
-                config_path=backtesting_config.config,
-                controllers_conf_dir_path=settings.app.controllers_path,
-                controllers_module=settings.app.controllers_module
-            )
+            # The cached instance is shared, but it is pickled into the worker, so each run works on its own copy
+            config_file = os.path.join(settings.app.controllers_path, backtesting_config.config)
+            controller_config = _load_controller_config(backtesting_config.config, os.path.getmtime(config_file))
         else:
             controller_config = backtesting_engine.get_controller_config_instance_from_dict(
                 config_data=backtesting_config.config,
                 controllers_module=settings.app.controllers_module
             )
-        backtesting_results = await backtesting_engine.run_backtesting(
-            controller_config=controller_config, trade_cost=backtesting_config.trade_cost,
-            start=int(backtesting_config.start_time), end=int(backtesting_config.end_time),
-            backtesting_resolution=backtesting_config.backtesting_resolution)
-        processed_data = backtesting_results["processed_data"]["features"].fillna(0)
-        executors_info = [e.to_dict() for e in backtesting_results["executors"]]
-        backtesting_results["processed_data"] = processed_data.to_dict()
-        results = backtesting_results["results"]
-        results["sharpe_ratio"] = results["sharpe_ratio"] if results["sharpe_ratio"] is not None else 0
-        return {
-            "executors": executors_info,
-            "processed_data": backtesting_results["processed_data"],
-            "results": backtesting_results["results"],
-        }
+        # The simulation is CPU-bound, so it runs in a worker process and the event loop stays responsive
+        body = await _submit_backtesting_job(
+            controller_config, backtesting_config.trade_cost,
+            int(backtesting_config.start_time), int(backtesting_config.end_time),
+            backtesting_config.backtesting_resolution
+        )
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         return {"error": str(e)}
@@ -380,20 +380,22 @@ async def _background_stop_and_archive(
         # Step 3: Mark the bot as stopping, and stop the bot trading process
         bots_manager.set_bot_stopping(bot_name_for_orchestrator)
         logger.info(f"Stopping bot trading process for {bot_name_for_orchestrator}")
-        stop_response = await bots_manager.stop_bot(
-            bot_name_for_orchestrator, 
+        
+        # Step 4: Wait for graceful shutdown. The bot replies once its stop has completed, so the container
+        # is stopped as soon as it is safe to, and at the latest after the previous 15 second grace period
+        logger.info(f"Waiting up to 15 seconds for bot {bot_name} to gracefully shutdown")
+        stop_response = await bots_manager.stop_bot_and_wait(
+            bot_name_for_orchestrator,
             skip_order_cancellation=skip_order_cancellation,
-            async_backend=True  # Always use async for background tasks
+            timeout=15.0
         )
         
         if not stop_response or not stop_response.get("success", False):
-            error_msg = stop_response.get('error', 'Unknown error') if stop_response else 'No response from bot orchestrator'
+            error_msg = stop_response.get('message', 'Unknown error') if stop_response else 'No response from bot orchestrator'
             logger.error(f"Failed to stop bot process: {error_msg}")
             return
-        
-        # Step 4: Wait for graceful shutdown (15 seconds as requested)
-        logger.info(f"Waiting 15 seconds for bot {bot_name} to gracefully shutdown")
-        await asyncio.sleep(15)
+        if stop_response.get("timeout"):
+            logger.warning(stop_response["message"])
         
         # Step 5: Stop the container with monitoring
         max_retries = 10
@@ -402,10 +404,10 @@ async def _background_stop_and_archive(
         
         for i in range(max_retries):
             logger.info(f"Attempting to stop container {container_name} (attempt {i+1}/{max_retries})")
-            docker_manager.stop_container(container_name)
+            await asyncio.to_thread(docker_manager.stop_container, container_name)
                 
             # Check if container is already stopped
-            container_status = docker_manager.get_container_status(container_name)
+            container_status = await asyncio.to_thread(docker_manager.get_container_status, container_name)
             if container_status.get("state", {}).get("status") == "exited":
                 container_stopped = True
                 logger.info(f"Container {container_name} is already stopped")
@@ -423,9 +425,10 @@ async def _background_stop_and_archive(
         
         try:
             if archive_locally:
-                bot_archiver.archive_locally(container_name, instance_dir)
+                await asyncio.to_thread(bot_archiver.archive_locally, container_name, instance_dir)
             else:
-                bot_archiver.archive_and_upload(container_name, instance_dir, bucket_name=s3_bucket)
+                await asyncio.to_thread(bot_archiver.archive_and_upload, container_name, instance_dir,
+                                        bucket_name=s3_bucket)
             logger.info(f"Successfully archived bot data for {container_name}")
         except Exception as e:
             logger.error(f"Archive failed: {str(e)}")
@@ -433,12 +436,12 @@ async def _background_stop_and_archive(
             
         # Step 7: Remove the container
         logging.info(f"Removing container {container_name}")
-        remove_response = docker_manager.remove_container(container_name, force=False)
+        remove_response = await asyncio.to_thread(docker_manager.remove_container, container_name, force=False)
         
         if not remove_response.get("success"):
             # If graceful remove fails, try force remove
             logging.warning("Graceful container removal failed, attempting force removal")
-            remove_response = docker_manager.remove_container(container_name, force=True)
+            remove_response = await asyncio.to_thread(docker_manager.remove_container, container_name, force=True)
         
         if remove_response.get("success"):
             logging.info(f"Successfully completed stop-and-archive for bot {bot_name}")
@@ -508,7 +511,7 @@ async def stop_and_archive_bot(
     Gracefully stop a bot and archive its data in the background.
     This initiates a background task that will:
     1. Stop the bot trading process via MQTT
-    2. Wait 15 seconds for graceful shutdown
+    2. Wait for the bot to confirm its graceful shutdown, for up to 15 seconds
     3. Monitor and stop the Docker container
     4. Archive the bot data (locally or to S3)
     5. Remove the container
@@ -523,13 +526,14 @@ async def stop_and_archive_bot(
         
         logging.info(f"Normalized bot_name: {actual_bot_name}, container_name: {container_name}")
         
-        # Step 2: Validate bot exists in active bots
-        active_bots = list(bots_manager.active_bots.keys())
+        # Step 2: Validate bot exists in active bots, checking the dict directly instead of copying its keys
+        active_bots_map = bots_manager.active_bots
         
         # Check if bot exists in active bots (could be stored as either format)
-        bot_found = (actual_bot_name in active_bots) or (container_name in active_bots)
+        bot_found = (actual_bot_name in active_bots_map) or (container_name in active_bots_map)
         
         if not bot_found:
+            active_bots = list(active_bots_map)
             return {
                 "status": "error",
                 "message": f"Bot '{actual_bot_name}' not found in active bots. Active bots: {active_bots}. Cannot perform graceful shutdown.",
@@ -543,7 +547,7 @@ async def stop_and_archive_bot(
             }
         
         # Use the format that's actually stored in active bots
-        bot_name_for_orchestrator = container_name if container_name in active_bots else actual_bot_name
+        bot_name_for_orchestrator = container_name if container_name in active_bots_map else actual_bot_name
 
         # Add the background task
         background_tasks.add_task(
@@ -594,7 +598,7 @@ async def deploy_v2_script(
         Dictionary with creation response and instance details
     """
     logging.info(f"Creating hummingbot instance with config: {config}")
-    response = docker_manager.create_hummingbot_instance(config)
+    response = await asyncio.to_thread(docker_manager.create_hummingbot_instance, config)
     
     # Track bot run if deployment was successful
     if response.get("success"):
@@ -670,7 +674,7 @@ async def deploy_v2_controllers(
         scripts_dir = os.path.join("conf", "scripts")
 
         script_config_path = os.path.join(scripts_dir, script_config_filename)
-        fs_util.dump_dict_to_yaml(script_config_path, script_config_content)
+        await asyncio.to_thread(fs_util.dump_dict_to_yaml, script_config_path, script_config_content)
         
         logging.info(f"Generated script config: {script_config_filename} with content: {script_config_content}")
         
@@ -684,7 +688,7 @@ async def deploy_v2_controllers(
         )
         
         # Deploy the instance using the existing method
-        response = docker_manager.create_hummingbot_instance(instance_config)
+        response = await asyncio.to_thread(docker_manager.create_hummingbot_instance, instance_config)
         
         if response.get("success"):
             response["script_config_generated"] = script_config_filename
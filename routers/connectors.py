@@ -1,28 +1,65 @@
-from typing import List, Optional
+import hashlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, Request, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Request, Response, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from hummingbot.client.settings import AllConnectorSettings
 
-from services.accounts_service import AccountsService
 from services.market_data_feed_manager import MarketDataFeedManager
-from deps import get_accounts_service
+from deps import AccountsDep
 
-router = APIRouter(tags=["Connectors"], prefix="/connectors")
+router = APIRouter(tags=["Connectors"], prefix="/connectors", default_response_class=ORJSONResponse)
 
+# Connector metadata never changes at runtime, so clients can reuse it for a while without revalidating
+_STATIC_CACHE_CONTROL = "max-age=300"
 
-@router.get("/", response_model=List[str])
-async def available_connectors():
+# Config map fields and their ETag per connector name
+_config_map_cache: Dict[str, Tuple[List[str], str]] = {}
+
+# Supported order type names per connector name, valid while the market data provider keeps the same instance
+_order_types_cache: Dict[str, Tuple[object, Tuple[str, ...]]] = {}
+
+
+def _etag(value) -> str:
+    """Compute a weak ETag from the JSON encoding of a value."""
+    return f'W/"{hashlib.blake2b(orjson.dumps(value)).hexdigest()[:16]}"'
+
+
+@lru_cache(maxsize=1)
+def _available_connectors() -> Tuple[str, ...]:
+    """
+    Build the connector names once, the connector settings are loaded at startup and never change at runtime.
+    A tuple is returned so the cached value shared across requests cannot be mutated.
+    """
+    return tuple(AllConnectorSettings.get_connector_settings().keys())
+
+
+@lru_cache(maxsize=1)
+def _connectors_etag() -> str:
+    """Compute the ETag of the connector list once."""
+    return _etag(_available_connectors())
+
+
+@router.get("/")
+async def available_connectors(request: Request):
     """
     Get a list of all available connectors.
 
     Returns:
-        List of connector names supported by the system
+        List of connector names supported by the system,
+        or 304 Not Modified if the If-None-Match header matches the connector list ETag
     """
-    return list(AllConnectorSettings.get_connector_settings().keys())
+    etag = _connectors_etag()
+    headers = {"ETag": etag, "Cache-Control": _STATIC_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(content=_available_connectors(), headers=headers)
 
 
-@router.get("/{connector_name}/config-map", response_model=List[str])
-async def get_connector_config_map(connector_name: str, accounts_service: AccountsService = Depends(get_accounts_service)):
+@router.get("/{connector_name}/config-map")
+async def get_connector_config_map(connector_name: str, request: Request, accounts_service: AccountsDep):
     """
     Get configuration fields required for a specific connector.
     
@@ -30,9 +67,20 @@ async def get_connector_config_map(connector_name: str, accounts_service: Accoun
         connector_name: Name of the connector to get config map for
         
     Returns:
-        List of configuration field names required for the connector
+        List of configuration field names required for the connector,
+        or 304 Not Modified if the If-None-Match header matches the config map ETag
     """
-    return accounts_service.get_connector_config_map(connector_name)
+    cached = _config_map_cache.get(connector_name)
+    if cached is None:
+        config_map = accounts_service.get_connector_config_map(connector_name)
+        cached = (config_map, _etag(config_map))
+        _config_map_cache[connector_name] = cached
+    config_map, etag = cached
+
+    headers = {"ETag": etag, "Cache-Control": _STATIC_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(content=config_map, headers=headers)
 
 
 @router.get("/{connector_name}/trading-rules")
@@ -67,7 +115,8 @@ async def get_trading_rules(
         if "error" in rules:
             raise HTTPException(status_code=404, detail=f"Connector '{connector_name}' not found or error: {rules['error']}")
         
-        return rules
+        # Rule values are already JSON-native, so skip FastAPI's encoder and serialize with orjson directly
+        return ORJSONResponse(content=rules)
         
     except HTTPException:
         raise
@@ -104,8 +153,12 @@ async def get_supported_order_types(request: Request, connector_name: str):
         
         # Get supported order types
         if hasattr(connector_instance, 'supported_order_types'):
-            order_types = [order_type.name for order_type in connector_instance.supported_order_types()]
-            return {"connector": connector_name, "supported_order_types": order_types}
+            cached = _order_types_cache.get(connector_name)
+            if cached is None or cached[0] is not connector_instance:
+                cached = (connector_instance,
+                          tuple(order_type.name for order_type in connector_instance.supported_order_types()))
+                _order_types_cache[connector_name] = cached
+            return {"connector": connector_name, "supported_order_types": cached[1]}
         else:
             raise HTTPException(status_code=404, detail=f"Connector '{connector_name}' does not support order types query")
         
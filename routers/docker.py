@@ -1,3 +1,4 @@
+import asyncio
 import os
 
 from fastapi import APIRouter, HTTPException, Depends
@@ -21,7 +22,7 @@ async def is_docker_running(docker_service: DockerService = Depends(get_docker_s
     Returns:
         Dictionary indicating if Docker is running
     """
-    return  docker_service.is_docker_running()
+    return await asyncio.to_thread(docker_service.is_docker_running)
 
 
 @router.get("/available-images/")
@@ -36,7 +37,7 @@ async def available_images(image_name: str = None, docker_service: DockerService
     Returns:
         Dictionary with list of available image tags
     """
-    available_images = docker_service.get_available_images()
+    available_images = await asyncio.to_thread(docker_service.get_available_images)
     if image_name:
         return [tag for image in available_images["images"] for tag in image.tags if image_name in tag]
     return [tag for tag in available_images["images"]]
@@ -54,7 +55,7 @@ async def active_containers(name_filter: str = None, docker_service: DockerServi
     Returns:
         List of active container information
     """
-    return docker_service.get_active_containers(name_filter)
+    return await asyncio.to_thread(docker_service.get_active_containers, name_filter)
 
 
 @router.get("/exited-containers")
@@ -69,7 +70,7 @@ async def exited_containers(name_filter: str = None, docker_service: DockerServi
     Returns:
         List of exited container information
     """
-    return docker_service.get_exited_containers(name_filter)
+    return await asyncio.to_thread(docker_service.get_exited_containers, name_filter)
 
 
 @router.post("/clean-exited-containers")
@@ -83,7 +84,7 @@ async def clean_exited_containers(docker_service: DockerService = Depends(get_do
     Returns:
         Response from cleanup operation
     """
-    return docker_service.clean_exited_containers()
+    return await asyncio.to_thread(docker_service.clean_exited_containers)
 
 
 @router.post("/remove-container/{container_name}")
@@ -116,15 +117,16 @@ async def remove_container(container_name: str, archive_locally: bool = True, s3
         )
     
     # Remove the container
-    response = docker_service.remove_container(container_name)
+    response = await asyncio.to_thread(docker_service.remove_container, container_name)
     # Form the instance directory path correctly
     instance_dir = os.path.join('bots', 'instances', container_name)
     try:
         # Archive the data
         if archive_locally:
-            bot_archiver.archive_locally(container_name, instance_dir)
+            await asyncio.to_thread(bot_archiver.archive_locally, container_name, instance_dir)
         else:
-            bot_archiver.archive_and_upload(container_name, instance_dir, bucket_name=s3_bucket)
+            await asyncio.to_thread(bot_archiver.archive_and_upload, container_name, instance_dir,
+                                    bucket_name=s3_bucket)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -143,7 +145,7 @@ async def stop_container(container_name: str, docker_service: DockerService = De
     Returns:
         Response from container stop operation
     """
-    return docker_service.stop_container(container_name)
+    return await asyncio.to_thread(docker_service.stop_container, container_name)
 
 
 @router.post("/start-container/{container_name}")
@@ -158,7 +160,7 @@ async def start_container(container_name: str, docker_service: DockerService = D
     Returns:
         Response from container start operation
     """
-    return docker_service.start_container(container_name)
+    return await asyncio.to_thread(docker_service.start_container, container_name)
 
 
 @router.post("/pull-image/")
@@ -14,6 +14,7 @@ from models import (
     PriceForQuoteVolumeRequest, VWAPForVolumeRequest, OrderBookQueryResult
 )
 from deps import get_market_data_feed_manager
+from utils.connector_manager import PERPETUAL_SUFFIXES
 
 router = APIRouter(tags=["Market Data"], prefix="/market-data")
 
@@ -204,7 +205,7 @@ async def get_funding_info(
         HTTPException: 400 for non-perpetual connectors, 500 for other errors
     """
     try:
-        if "_perpetual" not in request.connector_name.lower():
+        if not request.connector_name.lower().endswith(PERPETUAL_SUFFIXES):
             raise HTTPException(status_code=400, detail="Funding info is only available for perpetual trading pairs.")
         funding_info = await market_data_manager.get_funding_info(
             request.connector_name, 
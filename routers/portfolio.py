@@ -1,7 +1,13 @@
-from typing import Dict, List, Optional
-from datetime import datetime
+from typing import Annotated, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
 
-from fastapi import APIRouter, HTTPException, Depends
+import zlib
+
+import numpy as np
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
 
 from models.trading import (
     PortfolioStateFilterRequest,
@@ -9,17 +15,88 @@ from models.trading import (
     PortfolioDistributionFilterRequest,
     AccountsDistributionFilterRequest
 )
+from database import AccountRepository
+from deps import AccountsDep, history_semaphore, history_stream_semaphore
+from models import PaginatedResponse, TokenBalance
 from services.accounts_service import AccountsService
-from deps import get_accounts_service
-from models import PaginatedResponse
+from utils.streaming import ndjson_stream_response
+
+router = APIRouter(tags=["Portfolio"], prefix="/portfolio", default_response_class=ORJSONResponse)
+
+# Server-side bounds on the history time range so queries always hit the timestamp index
+MAX_WINDOW_DAYS = 90
+DEFAULT_WINDOW_DAYS = 7
+
+
+def _normalize_history_window(
+    start_time: Optional[datetime], end_time: Optional[datetime], cursor: Optional[str]
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Bound a history query's time range before it reaches the database.
+    
+    Args:
+        start_time: Requested start of the range
+        end_time: Requested end of the range
+        cursor: Pagination cursor of the request
+        
+    Returns:
+        The (start_time, end_time) to query. Without a cursor or a start time, the range defaults to the
+        DEFAULT_WINDOW_DAYS days before end_time, or before now when no end time is given. Cursor pages keep
+        whatever start time the request sends and are otherwise unbounded below; each is still limited to one
+        page of rows read backwards from the cursor through the timestamp index
+        
+    Raises:
+        HTTPException: 400 if the range spans more than MAX_WINDOW_DAYS days, a missing end counting as now
+    """
+    window_end = end_time or datetime.now()
+    if start_time is not None and window_end - start_time > timedelta(days=MAX_WINDOW_DAYS):
+        raise HTTPException(status_code=400, detail=f"Time range cannot exceed {MAX_WINDOW_DAYS} days")
+    if cursor is None and start_time is None:
+        start_time = window_end - timedelta(days=DEFAULT_WINDOW_DAYS)
+    return start_time, end_time
+
+
+def _pagination(limit: int, has_more: bool, next_cursor: Optional[str], cursor: Optional[str], **filters) -> Dict:
+    """
+    Build the pagination block of a paginated history response.
+    
+    Args:
+        limit: Page size of the request
+        has_more: Whether more items exist after this page
+        next_cursor: Cursor of the next page, if any
+        cursor: Cursor the request was made with
+        **filters: Request filters echoed back to the client, omitted when empty
+        
+    Returns:
+        Pagination dictionary for the response body
+    """
+    pagination = {"limit": limit, "has_more": has_more, "next_cursor": next_cursor, "current_cursor": cursor}
+    if filters:
+        pagination["filters"] = filters
+    return pagination
+
 
-router = APIRouter(tags=["Portfolio"], prefix="/portfolio")
+def _state_etag(accounts_service: AccountsService, filter_request: BaseModel) -> str:
+    """
+    Build a weak ETag for a response derived from the current account state.
+    
+    Args:
+        accounts_service: Service holding the account state
+        filter_request: Filters of the request
+        
+    Returns:
+        ETag covering both the state version and the filters, since each filter yields a different body
+    """
+    filters_hash = zlib.crc32(filter_request.model_dump_json().encode())
+    return f'W/"{accounts_service.get_state_version()}-{filters_hash:x}"'
 
 
-@router.post("/state", response_model=Dict[str, Dict[str, List[Dict]]])
+# response_model is kept for the OpenAPI schema only, the handler returns a Response so nothing is validated
+@router.post("/state", response_model=Dict[str, Dict[str, List[TokenBalance]]], response_class=ORJSONResponse)
 async def get_portfolio_state(
+    request: Request,
     filter_request: PortfolioStateFilterRequest,
-    accounts_service: AccountsService = Depends(get_accounts_service)
+    accounts_service: AccountsDep
 ):
     """
     Get the current state of all or filtered accounts portfolio.
@@ -28,115 +105,134 @@ async def get_portfolio_state(
         filter_request: JSON payload with filtering criteria
         
     Returns:
-        Dict containing account states with connector balances and token information
+        Dict containing account states with connector balances and token information,
+        or 304 Not Modified if the If-None-Match header matches the current state ETag
     """
-    await accounts_service.update_account_state()
+    await accounts_service.refresh_account_state()
+    etag = _state_etag(accounts_service, filter_request)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
     all_states = accounts_service.get_accounts_state()
     
-    # Apply account name filter first
+    # Apply account name filter first, referencing the account states rather than copying them
     if filter_request.account_names:
-        filtered_states = {}
-        for account_name in filter_request.account_names:
-            if account_name in all_states:
-                filtered_states[account_name] = all_states[account_name]
-        all_states = filtered_states
+        all_states = {account_name: all_states[account_name]
+                      for account_name in filter_request.account_names if account_name in all_states}
     
-    # Apply connector filter if specified
+    # Apply connector filter if specified, building a new dict so the service state is never modified
     if filter_request.connector_names:
-        for account_name, account_data in all_states.items():
-            # Filter connectors directly (they are at the top level of account_data)
-            filtered_connectors = {}
-            for connector_name in filter_request.connector_names:
-                if connector_name in account_data:
-                    filtered_connectors[connector_name] = account_data[connector_name]
-            # Replace account_data with only filtered connectors
-            all_states[account_name] = filtered_connectors
+        all_states = {
+            account_name: {
+                connector_name: account_data[connector_name]
+                for connector_name in filter_request.connector_names
+                if connector_name in account_data
+            }
+            for account_name, account_data in all_states.items()
+        }
     
-    return all_states
+    # Stream the state one account at a time, skipping per-field model validation and never encoding
+    # the whole portfolio into a single buffer. The accounts are snapshotted since the state keeps updating.
+    accounts = list(all_states.items())
+
+    async def state_chunks():
+        yield b"{"
+        for i, (account_name, account_data) in enumerate(accounts):
+            yield (b"," if i else b"") + orjson.dumps(account_name) + b":" + orjson.dumps(account_data)
+        yield b"}"
 
+    return StreamingResponse(state_chunks(), media_type="application/json", headers={"ETag": etag})
 
+
+# response_model is kept for the OpenAPI schema only, the handler returns a Response so nothing is validated
 @router.post("/history", response_model=PaginatedResponse)
 async def get_portfolio_history(
     filter_request: PortfolioHistoryFilterRequest,
-    accounts_service: AccountsService = Depends(get_accounts_service)
+    accounts_service: AccountsDep,
+    stream: Annotated[bool, Query(description="Stream history items as newline-delimited JSON")] = False
 ):
     """
     Get the historical state of all or filtered accounts portfolio with pagination.
     
     Args:
         filter_request: JSON payload with filtering criteria
+        stream: If true, stream the history items as NDJSON instead of a paginated JSON body
         
     Returns:
-        Paginated response with historical portfolio data
+        Paginated response with historical portfolio data, or an NDJSON stream of history items
+        
+    Raises:
+        HTTPException: 400 if the requested time range exceeds MAX_WINDOW_DAYS days or the cursor is invalid
     """
+    # Convert integer timestamps to datetime objects
+    start_time_dt = datetime.fromtimestamp(filter_request.start_time / 1000) if filter_request.start_time else None
+    end_time_dt = datetime.fromtimestamp(filter_request.end_time / 1000) if filter_request.end_time else None
+    start_time_dt, end_time_dt = _normalize_history_window(start_time_dt, end_time_dt, filter_request.cursor)
+    # Decode the keyset cursor once for every query below. An unreadable cursor is rejected rather than
+    # silently restarting from the first page
+    cursor_ts, cursor_id = (
+        AccountRepository.decode_cursor(filter_request.cursor) if filter_request.cursor else (None, None)
+    )
+    if filter_request.cursor and cursor_ts is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     try:
-        # Convert integer timestamps to datetime objects
-        start_time_dt = datetime.fromtimestamp(filter_request.start_time / 1000) if filter_request.start_time else None
-        end_time_dt = datetime.fromtimestamp(filter_request.end_time / 1000) if filter_request.end_time else None
-        
-        if not filter_request.account_names:
-            # Get history for all accounts
+        if stream:
+            async def ndjson_rows():
+                # The stream runs after the handler returns, so it holds its own stream slot
+                async with history_stream_semaphore:
+                    async for item in accounts_service.iter_account_state_history(
+                        limit=filter_request.limit,
+                        account_names=filter_request.account_names,
+                        connector_names=filter_request.connector_names,
+                        cursor_ts=cursor_ts,
+                        cursor_id=cursor_id,
+                        start_time=start_time_dt,
+                        end_time=end_time_dt
+                    ):
+                        yield orjson.dumps(item) + b"\n"
+
+            return ndjson_stream_response(ndjson_rows())
+
+        async with history_semaphore:
+            # One keyset query covers all or the requested accounts, so the cursor stays exact across pages
             data, next_cursor, has_more = await accounts_service.load_account_state_history(
                 limit=filter_request.limit,
-                cursor=filter_request.cursor,
+                cursor_ts=cursor_ts,
+                cursor_id=cursor_id,
                 start_time=start_time_dt,
-                end_time=end_time_dt
+                end_time=end_time_dt,
+                account_names=filter_request.account_names
             )
-        else:
-            # Get history for specific accounts - need to aggregate
-            all_data = []
-            for account_name in filter_request.account_names:
-                acc_data, _, _ = await accounts_service.get_account_state_history(
-                    account_name=account_name,
-                    limit=filter_request.limit,
-                    cursor=filter_request.cursor,
-                    start_time=start_time_dt,
-                    end_time=end_time_dt
-                )
-                all_data.extend(acc_data)
-            
-            # Sort by timestamp and apply pagination
-            all_data.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-            
-            # Apply limit
-            data = all_data[:filter_request.limit]
-            has_more = len(all_data) > filter_request.limit
-            next_cursor = data[-1]["timestamp"] if data and has_more else None
-        
+
         # Apply connector filter to the data if specified
         if filter_request.connector_names:
             for item in data:
                 for account_name, account_data in item.items():
                     if isinstance(account_data, dict) and "connectors" in account_data:
-                        filtered_connectors = {}
-                        for connector_name in filter_request.connector_names:
-                            if connector_name in account_data["connectors"]:
-                                filtered_connectors[connector_name] = account_data["connectors"][connector_name]
-                        account_data["connectors"] = filtered_connectors
+                        connectors = account_data["connectors"]
+                        account_data["connectors"] = {connector_name: connectors[connector_name]
+                                                      for connector_name in filter_request.connector_names
+                                                      if connector_name in connectors}
         
-        return PaginatedResponse(
-            data=data,
-            pagination={
-                "limit": filter_request.limit,
-                "has_more": has_more,
-                "next_cursor": next_cursor,
-                "current_cursor": filter_request.cursor,
-                "filters": {
-                    "account_names": filter_request.account_names,
-                    "connector_names": filter_request.connector_names,
-                    "start_time": filter_request.start_time,
-                    "end_time": filter_request.end_time
-                }
-            }
-        )
+        return ORJSONResponse(content={
+            "data": data,
+            "pagination": _pagination(
+                filter_request.limit, has_more, next_cursor, filter_request.cursor,
+                account_names=filter_request.account_names,
+                connector_names=filter_request.connector_names,
+                start_time=filter_request.start_time,
+                end_time=filter_request.end_time
+            )
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/distribution")
 async def get_portfolio_distribution(
+    request: Request,
     filter_request: PortfolioDistributionFilterRequest,
-    accounts_service: AccountsService = Depends(get_accounts_service)
+    accounts_service: AccountsDep
 ):
     """
     Get portfolio distribution by tokens with percentages across all or filtered accounts.
@@ -145,58 +241,29 @@ async def get_portfolio_distribution(
         filter_request: JSON payload with filtering criteria
         
     Returns:
-        Dictionary with token distribution including percentages, values, and breakdown by accounts/connectors
+        Dictionary with token distribution including percentages, values, and breakdown by accounts/connectors,
+        or 304 Not Modified if the If-None-Match header matches the current distribution ETag
+
+    Raises:
+        HTTPException: 404 if a single account is requested and it does not exist
     """
+    etag = _state_etag(accounts_service, filter_request)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
     if not filter_request.account_names:
         # Get distribution for all accounts
         distribution = accounts_service.get_portfolio_distribution()
     elif len(filter_request.account_names) == 1:
-        # Single account - use existing method
-        distribution = accounts_service.get_portfolio_distribution(filter_request.account_names[0])
+        # Single account - check it exists before doing any aggregation work
+        account_name = filter_request.account_names[0]
+        if not accounts_service.account_exists(account_name):
+            raise HTTPException(status_code=404, detail=f"Account '{account_name}' not found")
+        distribution = accounts_service.get_portfolio_distribution(account_name)
     else:
-        # Multiple accounts - need to aggregate
-        aggregated_distribution = {
-            "tokens": {},
-            "total_value": 0,
-            "token_count": 0,
-            "accounts": {}
-        }
-        
-        for account_name in filter_request.account_names:
-            account_dist = accounts_service.get_portfolio_distribution(account_name)
-            
-            # Skip if account doesn't exist or has error
-            if account_dist.get("error") or account_dist.get("token_count", 0) == 0:
-                continue
-            
-            # Aggregate token data
-            for token, token_data in account_dist.get("tokens", {}).items():
-                if token not in aggregated_distribution["tokens"]:
-                    aggregated_distribution["tokens"][token] = {
-                        "token": token,
-                        "value": 0,
-                        "percentage": 0,
-                        "accounts": {}
-                    }
-                
-                aggregated_distribution["tokens"][token]["value"] += token_data.get("value", 0)
-                
-                # Copy account-specific data
-                for acc_name, acc_data in token_data.get("accounts", {}).items():
-                    aggregated_distribution["tokens"][token]["accounts"][acc_name] = acc_data
-            
-            aggregated_distribution["total_value"] += account_dist.get("total_value", 0)
-            aggregated_distribution["accounts"][account_name] = account_dist.get("accounts", {}).get(account_name, {})
-        
-        # Recalculate percentages
-        total_value = aggregated_distribution["total_value"]
-        if total_value > 0:
-            for token_data in aggregated_distribution["tokens"].values():
-                token_data["percentage"] = (token_data["value"] / total_value) * 100
-        
-        aggregated_distribution["token_count"] = len(aggregated_distribution["tokens"])
-        
-        distribution = aggregated_distribution
+        # Multiple accounts - aggregated by the service in one pass over the balances, which ignores unknown
+        # accounts and shares the result with identical requests until the state changes
+        distribution = accounts_service.get_portfolio_distribution(account_names=filter_request.account_names)
     
     # Apply connector filter if specified
     if filter_request.connector_names:
@@ -262,13 +329,14 @@ async def get_portfolio_distribution(
             "account_filter": distribution.get("account_filter", "filtered")
         }
     
-    return distribution
+    return ORJSONResponse(content=distribution, headers={"ETag": etag})
 
 
 @router.post("/accounts-distribution")
 async def get_accounts_distribution(
+    request: Request,
     filter_request: AccountsDistributionFilterRequest,
-    accounts_service: AccountsService = Depends(get_accounts_service)
+    accounts_service: AccountsDep
 ):
     """
     Get portfolio distribution by accounts with percentages.
@@ -277,55 +345,72 @@ async def get_accounts_distribution(
         filter_request: JSON payload with filtering criteria
         
     Returns:
-        Dictionary with account distribution including percentages, values, and breakdown by connectors
+        Dictionary with account distribution including percentages, values, and breakdown by connectors,
+        or 304 Not Modified if the If-None-Match header matches the current distribution ETag
     """
+    etag = _state_etag(accounts_service, filter_request)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
     all_distribution = accounts_service.get_account_distribution()
     
     # If no filter, return all accounts
     if not filter_request.account_names:
-        return all_distribution
-    
-    # Filter the distribution by requested accounts
-    filtered_distribution = {
-        "accounts": {},
-        "total_value": 0,
-        "account_count": 0
-    }
+        return ORJSONResponse(content=all_distribution, headers={"ETag": etag})
     
-    for account_name in filter_request.account_names:
-        if account_name in all_distribution.get("accounts", {}):
-            filtered_distribution["accounts"][account_name] = all_distribution["accounts"][account_name]
-            filtered_distribution["total_value"] += all_distribution["accounts"][account_name].get("total_value", 0)
+    # Filter the distribution by requested accounts. The service result is cached and shared between requests,
+    # so filtered entries are always rebuilt instead of modified in place
+    requested = set(filter_request.account_names)
+    hits = [account_data for account_data in all_distribution.get("distribution", [])
+            if account_data["account"] in requested]
     
     # Apply connector filter if specified
     if filter_request.connector_names:
-        for account_name, account_data in filtered_distribution["accounts"].items():
-            if "connectors" in account_data:
-                filtered_connectors = {}
-                for connector_name in filter_request.connector_names:
-                    if connector_name in account_data["connectors"]:
-                        filtered_connectors[connector_name] = account_data["connectors"][connector_name]
-                account_data["connectors"] = filtered_connectors
-                
-                # Recalculate account total after connector filtering
-                new_total = sum(
-                    conn_data.get("total_balance_in_usd", 0) 
-                    for conn_data in filtered_connectors.values()
-                )
-                account_data["total_value"] = new_total
-        
-        # Recalculate total_value after connector filtering
-        filtered_distribution["total_value"] = sum(
-            acc_data.get("total_value", 0) 
-            for acc_data in filtered_distribution["accounts"].values()
+        hits = [
+            {
+                "account": account_data["account"],
+                "connectors": {
+                    connector_name: account_data["connectors"][connector_name]
+                    for connector_name in filter_request.connector_names
+                    if connector_name in account_data["connectors"]
+                }
+            }
+            for account_data in hits
+        ]
+        values = np.fromiter(
+            (sum(conn_data["value"] for conn_data in account_data["connectors"].values()) for account_data in hits),
+            dtype=np.float64, count=len(hits)
         )
-
-    # Recalculate percentages
-    total_value = filtered_distribution["total_value"]
-    if total_value > 0:
-        for account_data in filtered_distribution["accounts"].values():
-            account_data["percentage"] = (account_data.get("total_value", 0) / total_value) * 100
+    else:
+        values = np.fromiter((account_data["total_value"] for account_data in hits), dtype=np.float64, count=len(hits))
+    
+    # Percentages are relative to the filtered total, computed for all accounts at once
+    total_value = float(values.sum())
+    scale = 100.0 / total_value if total_value > 0 else 0.0
+    percentages = values * scale
     
-    filtered_distribution["account_count"] = len(filtered_distribution["accounts"])
+    distribution = [
+        {
+            "account": account_data["account"],
+            "total_value": round(float(value), 6),
+            "percentage": round(float(percentage), 4),
+            "connectors": {
+                connector_name: {
+                    "value": conn_data["value"],
+                    "percentage": round(conn_data["value"] * scale, 4)
+                }
+                for connector_name, conn_data in account_data["connectors"].items()
+            }
+        }
+        for account_data, value, percentage in zip(hits, values, percentages)
+    ]
+    if filter_request.connector_names:
+        distribution.sort(key=lambda x: x["total_value"], reverse=True)
+    
+    filtered_distribution = {
+        "total_portfolio_value": round(total_value, 6),
+        "account_count": len(distribution),
+        "distribution": distribution
+    }
     
-    return filtered_distribution
\ No newline at end of file
+    return ORJSONResponse(content=filtered_distribution, headers={"ETag": etag})
\ No newline at end of file
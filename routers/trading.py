@@ -1,17 +1,24 @@
+import asyncio
+import heapq
 import logging
 import math
+from datetime import datetime, timezone
+from itertools import chain
 
-from typing import Dict, List, Optional
+from typing import Annotated, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
 
 # Create module-specific logger
 logger = logging.getLogger(__name__)
 from hummingbot.core.data_type.common import OrderType, PositionAction, PositionMode, TradeType
+from hummingbot.core.data_type.in_flight_order import OrderState
 from pydantic import BaseModel
 from starlette import status
 
-from deps import get_accounts_service, get_market_data_feed_manager
+from deps import get_market_data_feed_manager, history_semaphore, history_stream_semaphore, AccountsDep, ValidAccountDep
 from models import (
     ActiveOrderFilterRequest,
     FundingPaymentFilterRequest,
@@ -23,16 +30,18 @@ from models import (
     TradeResponse,
 )
 from models.accounts import LeverageRequest, PositionModeRequest
-from services.accounts_service import AccountsService
+from utils.http_cache import etag_json_response
+from utils.pagination import decode_cursor
+from utils.streaming import ndjson_stream_response
 
-router = APIRouter(tags=["Trading"], prefix="/trading")
+router = APIRouter(tags=["Trading"], prefix="/trading", default_response_class=ORJSONResponse)
 
 
 # Trade Execution
 @router.post("/orders", response_model=TradeResponse, status_code=status.HTTP_201_CREATED)
 async def place_trade(
     trade_request: TradeRequest,
-    accounts_service: AccountsService = Depends(get_accounts_service),
+    accounts_service: AccountsDep,
     market_data_manager=Depends(get_market_data_feed_manager),
 ):
     """
@@ -86,10 +95,10 @@ async def place_trade(
 
 @router.post("/{account_name}/{connector_name}/orders/{client_order_id}/cancel")
 async def cancel_order(
-    account_name: str,
+    account_name: ValidAccountDep,
     connector_name: str,
     client_order_id: str,
-    accounts_service: AccountsService = Depends(get_accounts_service),
+    accounts_service: AccountsDep,
 ):
     """
     Cancel a specific order by its client order ID.
@@ -119,7 +128,7 @@ async def cancel_order(
 
 
 @router.post("/positions", response_model=PaginatedResponse)
-async def get_positions(filter_request: PositionFilterRequest, accounts_service: AccountsService = Depends(get_accounts_service)):
+async def get_positions(filter_request: PositionFilterRequest, accounts_service: AccountsDep):
     """
     Get current positions across all or filtered perpetual connectors.
 
@@ -136,35 +145,48 @@ async def get_positions(filter_request: PositionFilterRequest, accounts_service:
         HTTPException: 500 if there's an error fetching positions
     """
     try:
-        all_positions = []
         all_connectors = accounts_service.connector_manager.get_all_connectors()
 
         # Filter accounts
         accounts_to_check = filter_request.account_names if filter_request.account_names else list(all_connectors.keys())
 
+        # Collect the perpetual connectors to query
+        connector_keys = []
         for account_name in accounts_to_check:
             if account_name in all_connectors:
-                # Filter connectors
-                connectors_to_check = (
-                    filter_request.connector_names
-                    if filter_request.connector_names
-                    else list(all_connectors[account_name].keys())
-                )
-
-                for connector_name in connectors_to_check:
-                    # Only fetch positions from perpetual connectors
-                    if connector_name in all_connectors[account_name] and "_perpetual" in connector_name:
-                        try:
-                            positions = await accounts_service.get_account_positions(account_name, connector_name)
-                            # Add cursor-friendly identifier to each position
-                            for position in positions:
-                                position["_cursor_id"] = f"{account_name}:{connector_name}:{position.get('trading_pair', '')}"
-                            all_positions.extend(positions)
-                        except Exception as e:
-                            # Log error but continue with other connectors
-                            import logging
-
-                            logger.warning(f"Failed to get positions for {account_name}/{connector_name}: {e}")
+                # Only fetch positions from perpetual connectors
+                perpetual_connectors = accounts_service.connector_manager.get_perpetual_connectors(account_name)
+                if filter_request.connector_names:
+                    connectors_to_check = [c for c in filter_request.connector_names if c in perpetual_connectors]
+                else:
+                    connectors_to_check = perpetual_connectors
+                connector_keys.extend((account_name, connector_name) for connector_name in connectors_to_check)
+
+        # Spot-only or unknown accounts have nothing to fetch, skip the gather, merge and pagination
+        if not connector_keys:
+            return PaginatedResponse(
+                data=[],
+                pagination={"limit": filter_request.limit, "has_more": False, "next_cursor": None, "total_count": 0},
+            )
+
+        # Fetch positions from all connectors concurrently
+        results = await asyncio.gather(
+            *[accounts_service.get_account_positions(account_name, connector_name)
+              for account_name, connector_name in connector_keys],
+            return_exceptions=True
+        )
+        position_lists = []
+        for (account_name, connector_name), positions in zip(connector_keys, results):
+            if isinstance(positions, Exception):
+                # Log error but continue with other connectors
+                logger.warning("Failed to get positions for %s/%s: %s", account_name, connector_name, positions)
+                continue
+            # Add cursor-friendly identifier to each position
+            for position in positions:
+                position["_cursor_id"] = f"{account_name}:{connector_name}:{position.get('trading_pair', '')}"
+            position_lists.append(positions)
+        # Concatenate once in C instead of growing the list connector by connector
+        all_positions = list(chain.from_iterable(position_lists))
 
         # Sort by cursor_id for consistent pagination
         all_positions.sort(key=lambda x: x.get("_cursor_id", ""))
@@ -205,9 +227,10 @@ async def get_positions(filter_request: PositionFilterRequest, accounts_service:
 
 
 # Active Orders Management - Real-time from connectors
+# response_model is kept for the OpenAPI schema only, the handler returns a Response so nothing is validated
 @router.post("/orders/active", response_model=PaginatedResponse)
 async def get_active_orders(
-    filter_request: ActiveOrderFilterRequest, accounts_service: AccountsService = Depends(get_accounts_service)
+    request: Request, filter_request: ActiveOrderFilterRequest, accounts_service: AccountsDep
 ):
     """
     Get active (in-flight) orders across all or filtered accounts and connectors.
@@ -219,7 +242,8 @@ async def get_active_orders(
         filter_request: JSON payload with filtering criteria
 
     Returns:
-        Paginated response with active order data and pagination metadata
+        Paginated response with active order data and pagination metadata,
+        or 304 Not Modified if the If-None-Match header matches the page ETag
 
     Raises:
         HTTPException: 500 if there's an error fetching orders
@@ -259,9 +283,7 @@ async def get_active_orders(
 
                         except Exception as e:
                             # Log error but continue with other connectors
-                            import logging
-
-                            logger.warning(f"Failed to get active orders for {account_name}/{connector_name}: {e}")
+                            logger.warning("Failed to get active orders for %s/%s: %s", account_name, connector_name, e)
 
         # Sort by cursor_id for consistent pagination
         all_active_orders.sort(key=lambda x: x.get("_cursor_id", ""))
@@ -287,15 +309,16 @@ async def get_active_orders(
         for order in page_orders:
             order.pop("_cursor_id", None)
 
-        return PaginatedResponse(
-            data=page_orders,
-            pagination={
+        # Pollers get a 304 while the page is unchanged
+        return etag_json_response(request, {
+            "data": page_orders,
+            "pagination": {
                 "limit": filter_request.limit,
                 "has_more": has_more,
                 "next_cursor": next_cursor,
                 "total_count": len(all_active_orders),
             },
-        )
+        })
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching active orders: {str(e)}")
@@ -303,19 +326,30 @@ async def get_active_orders(
 
 # Historical Order Management - From registry/database
 @router.post("/orders/search", response_model=PaginatedResponse)
-async def get_orders(filter_request: OrderFilterRequest, accounts_service: AccountsService = Depends(get_accounts_service)):
+async def get_orders(
+    filter_request: OrderFilterRequest,
+    accounts_service: AccountsDep,
+    stream: Annotated[bool, Query(description="Stream orders as newline-delimited JSON")] = False
+):
     """
     Get historical order data across all or filtered accounts from the database/registry.
 
     Args:
         filter_request: JSON payload with filtering criteria
+        stream: If true, stream the orders as NDJSON instead of a paginated JSON body
 
     Returns:
-        Paginated response with historical order data and pagination metadata
+        Paginated response with historical order data and pagination metadata, or an NDJSON stream of orders
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid
     """
+    # Keyset pagination: every filter is applied in the database, so one query returns the page. An unreadable
+    # cursor is rejected rather than silently restarting from the first page
+    cursor_ts, cursor_id = decode_cursor(filter_request.cursor) if filter_request.cursor else (None, None)
+    if filter_request.cursor and cursor_ts is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     try:
-        all_orders = []
-
         # Determine which accounts to query
         if filter_request.account_names:
             accounts_to_check = filter_request.account_names
@@ -324,66 +358,45 @@ async def get_orders(filter_request: OrderFilterRequest, accounts_service: Accou
             all_connectors = accounts_service.connector_manager.get_all_connectors()
             accounts_to_check = list(all_connectors.keys())
 
-        # Collect orders from all specified accounts
-        for account_name in accounts_to_check:
-            try:
-                orders = await accounts_service.get_orders(
-                    account_name=account_name,
-                    connector_name=(
-                        filter_request.connector_names[0]
-                        if filter_request.connector_names and len(filter_request.connector_names) == 1
-                        else None
-                    ),
-                    trading_pair=(
-                        filter_request.trading_pairs[0]
-                        if filter_request.trading_pairs and len(filter_request.trading_pairs) == 1
-                        else None
-                    ),
-                    status=filter_request.status,
-                    start_time=filter_request.start_time,
-                    end_time=filter_request.end_time,
-                    limit=filter_request.limit * 2,  # Get more for filtering
-                    offset=0,
-                )
-                # Add cursor-friendly identifier to each order
-                for order in orders:
-                    order["_cursor_id"] = f"{order.get('timestamp', 0)}:{order.get('client_order_id', '')}"
-                all_orders.extend(orders)
-            except Exception as e:
-                # Log error but continue with other accounts
-                import logging
-
-                logger.warning(f"Failed to get orders for {account_name}: {e}")
-
-        # Apply filters for multiple values
-        if filter_request.connector_names and len(filter_request.connector_names) > 1:
-            all_orders = [order for order in all_orders if order.get("connector_name") in filter_request.connector_names]
-        if filter_request.trading_pairs and len(filter_request.trading_pairs) > 1:
-            all_orders = [order for order in all_orders if order.get("trading_pair") in filter_request.trading_pairs]
-
-        # Sort by timestamp (most recent first) and then by cursor_id for consistency
-        all_orders.sort(key=lambda x: (x.get("timestamp", 0), x.get("_cursor_id", "")), reverse=True)
-
-        # Apply cursor-based pagination
-        start_index = 0
-        if filter_request.cursor:
-            # Find the order after the cursor
-            for i, order in enumerate(all_orders):
-                if order.get("_cursor_id") == filter_request.cursor:
-                    start_index = i + 1
-                    break
-
-        # Get page of results
-        end_index = start_index + filter_request.limit
-        page_orders = all_orders[start_index:end_index]
-
-        # Determine next cursor and has_more
-        has_more = end_index < len(all_orders)
-        next_cursor = page_orders[-1].get("_cursor_id") if page_orders and has_more else None
-
-        # Clean up cursor_id from response data
-        for order in page_orders:
-            order.pop("_cursor_id", None)
+        # No account to read from means nothing to return; an empty list must not reach the query as "no filter"
+        if not accounts_to_check:
+            if stream:
+                return ndjson_stream_response(iter(()))
+            return PaginatedResponse(
+                data=[],
+                pagination={"limit": filter_request.limit, "has_more": False, "next_cursor": None, "total_count": 0},
+            )
+
+        if stream:
+            async def ndjson_rows():
+                # The stream runs after the handler returns, so it holds its own stream slot
+                async with history_stream_semaphore:
+                    async for row in accounts_service.iter_orders(
+                        account_names=accounts_to_check,
+                        connector_names=filter_request.connector_names,
+                        trading_pairs=filter_request.trading_pairs,
+                        status=filter_request.status,
+                        start_time=filter_request.start_time,
+                        end_time=filter_request.end_time,
+                        limit=filter_request.limit,
+                        cursor_ts=cursor_ts,
+                        cursor_id=cursor_id,
+                    ):
+                        yield orjson.dumps(row) + b"\n"
+
+            return ndjson_stream_response(ndjson_rows())
+
+        page_orders, next_cursor, has_more, total_count = await accounts_service.get_orders(
+            account_names=accounts_to_check,
+            connector_names=filter_request.connector_names,
+            trading_pairs=filter_request.trading_pairs,
+            status=filter_request.status,
+            start_time=filter_request.start_time,
+            end_time=filter_request.end_time,
+            limit=filter_request.limit,
+            cursor_ts=cursor_ts,
+            cursor_id=cursor_id,
+        )
 
         return PaginatedResponse(
             data=page_orders,
@@ -391,7 +404,7 @@ async def get_orders(filter_request: OrderFilterRequest, accounts_service: Accou
                 "limit": filter_request.limit,
                 "has_more": has_more,
                 "next_cursor": next_cursor,
-                "total_count": len(all_orders),
+                "total_count": total_count,
             },
         )
     except Exception as e:
@@ -400,19 +413,30 @@ async def get_orders(filter_request: OrderFilterRequest, accounts_service: Accou
 
 # Trade History
 @router.post("/trades", response_model=PaginatedResponse)
-async def get_trades(filter_request: TradeFilterRequest, accounts_service: AccountsService = Depends(get_accounts_service)):
+async def get_trades(
+    filter_request: TradeFilterRequest,
+    accounts_service: AccountsDep,
+    stream: Annotated[bool, Query(description="Stream trades as newline-delimited JSON")] = False
+):
     """
     Get trade history across all or filtered accounts with complex filtering.
 
     Args:
         filter_request: JSON payload with filtering criteria
+        stream: If true, stream the trades as NDJSON instead of a paginated JSON body
 
     Returns:
-        Paginated response with trade data and pagination metadata
+        Paginated response with trade data and pagination metadata, or an NDJSON stream of trades
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid
     """
+    # Keyset pagination: every filter is applied in the database, so one query returns the page. An unreadable
+    # cursor is rejected rather than silently restarting from the first page
+    cursor_ts, cursor_id = decode_cursor(filter_request.cursor) if filter_request.cursor else (None, None)
+    if filter_request.cursor and cursor_ts is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     try:
-        all_trades = []
-
         # Determine which accounts to query
         if filter_request.account_names:
             accounts_to_check = filter_request.account_names
@@ -421,72 +445,45 @@ async def get_trades(filter_request: TradeFilterRequest, accounts_service: Accou
             all_connectors = accounts_service.connector_manager.get_all_connectors()
             accounts_to_check = list(all_connectors.keys())
 
-        # Collect trades from all specified accounts
-        for account_name in accounts_to_check:
-            try:
-                trades = await accounts_service.get_trades(
-                    account_name=account_name,
-                    connector_name=(
-                        filter_request.connector_names[0]
-                        if filter_request.connector_names and len(filter_request.connector_names) == 1
-                        else None
-                    ),
-                    trading_pair=(
-                        filter_request.trading_pairs[0]
-                        if filter_request.trading_pairs and len(filter_request.trading_pairs) == 1
-                        else None
-                    ),
-                    trade_type=(
-                        filter_request.trade_types[0]
-                        if filter_request.trade_types and len(filter_request.trade_types) == 1
-                        else None
-                    ),
-                    start_time=filter_request.start_time,
-                    end_time=filter_request.end_time,
-                    limit=filter_request.limit * 2,  # Get more for filtering
-                    offset=0,
-                )
-                # Add cursor-friendly identifier to each trade
-                for trade in trades:
-                    trade["_cursor_id"] = f"{trade.get('timestamp', 0)}:{trade.get('trade_id', '')}"
-                all_trades.extend(trades)
-            except Exception as e:
-                # Log error but continue with other accounts
-                import logging
-
-                logger.warning(f"Failed to get trades for {account_name}: {e}")
-
-        # Apply filters for multiple values
-        if filter_request.connector_names and len(filter_request.connector_names) > 1:
-            all_trades = [trade for trade in all_trades if trade.get("connector_name") in filter_request.connector_names]
-        if filter_request.trading_pairs and len(filter_request.trading_pairs) > 1:
-            all_trades = [trade for trade in all_trades if trade.get("trading_pair") in filter_request.trading_pairs]
-        if filter_request.trade_types and len(filter_request.trade_types) > 1:
-            all_trades = [trade for trade in all_trades if trade.get("trade_type") in filter_request.trade_types]
-
-        # Sort by timestamp (most recent first) and then by cursor_id for consistency
-        all_trades.sort(key=lambda x: (x.get("timestamp", 0), x.get("_cursor_id", "")), reverse=True)
-
-        # Apply cursor-based pagination
-        start_index = 0
-        if filter_request.cursor:
-            # Find the trade after the cursor
-            for i, trade in enumerate(all_trades):
-                if trade.get("_cursor_id") == filter_request.cursor:
-                    start_index = i + 1
-                    break
-
-        # Get page of results
-        end_index = start_index + filter_request.limit
-        page_trades = all_trades[start_index:end_index]
-
-        # Determine next cursor and has_more
-        has_more = end_index < len(all_trades)
-        next_cursor = page_trades[-1].get("_cursor_id") if page_trades and has_more else None
-
-        # Clean up cursor_id from response data
-        for trade in page_trades:
-            trade.pop("_cursor_id", None)
+        # No account to read from means nothing to return; an empty list must not reach the query as "no filter"
+        if not accounts_to_check:
+            if stream:
+                return ndjson_stream_response(iter(()))
+            return PaginatedResponse(
+                data=[],
+                pagination={"limit": filter_request.limit, "has_more": False, "next_cursor": None, "total_count": 0},
+            )
+
+        if stream:
+            async def ndjson_rows():
+                # The stream runs after the handler returns, so it holds its own stream slot
+                async with history_stream_semaphore:
+                    async for row in accounts_service.iter_trades(
+                        account_names=accounts_to_check,
+                        connector_names=filter_request.connector_names,
+                        trading_pairs=filter_request.trading_pairs,
+                        trade_types=filter_request.trade_types,
+                        start_time=filter_request.start_time,
+                        end_time=filter_request.end_time,
+                        limit=filter_request.limit,
+                        cursor_ts=cursor_ts,
+                        cursor_id=cursor_id,
+                    ):
+                        yield orjson.dumps(row) + b"\n"
+
+            return ndjson_stream_response(ndjson_rows())
+
+        page_trades, next_cursor, has_more, total_count = await accounts_service.get_trades(
+            account_names=accounts_to_check,
+            connector_names=filter_request.connector_names,
+            trading_pairs=filter_request.trading_pairs,
+            trade_types=filter_request.trade_types,
+            start_time=filter_request.start_time,
+            end_time=filter_request.end_time,
+            limit=filter_request.limit,
+            cursor_ts=cursor_ts,
+            cursor_id=cursor_id,
+        )
 
         return PaginatedResponse(
             data=page_trades,
@@ -494,7 +491,7 @@ async def get_trades(filter_request: TradeFilterRequest, accounts_service: Accou
                 "limit": filter_request.limit,
                 "has_more": has_more,
                 "next_cursor": next_cursor,
-                "total_count": len(all_trades),
+                "total_count": total_count,
             },
         )
     except Exception as e:
@@ -503,10 +500,10 @@ async def get_trades(filter_request: TradeFilterRequest, accounts_service: Accou
 
 @router.post("/{account_name}/{connector_name}/position-mode")
 async def set_position_mode(
-    account_name: str,
+    account_name: ValidAccountDep,
     connector_name: str,
     request: PositionModeRequest,
-    accounts_service: AccountsService = Depends(get_accounts_service),
+    accounts_service: AccountsDep,
 ):
     """
     Set position mode for a perpetual connector.
@@ -520,7 +517,7 @@ async def set_position_mode(
         Success message with status
 
     Raises:
-        HTTPException: 400 if not a perpetual connector or invalid position mode
+        HTTPException: 400 if not a perpetual connector or invalid position mode, 404 if account not found
     """
     try:
         # Convert string to PositionMode enum
@@ -539,7 +536,7 @@ async def set_position_mode(
 
 @router.get("/{account_name}/{connector_name}/position-mode")
 async def get_position_mode(
-    account_name: str, connector_name: str, accounts_service: AccountsService = Depends(get_accounts_service)
+    account_name: ValidAccountDep, connector_name: str, accounts_service: AccountsDep
 ):
     """
     Get current position mode for a perpetual connector.
@@ -552,7 +549,7 @@ async def get_position_mode(
         Dictionary with current position mode, connector name, and account name
 
     Raises:
-        HTTPException: 400 if not a perpetual connector
+        HTTPException: 400 if not a perpetual connector, 404 if account not found
     """
     try:
         result = await accounts_service.get_position_mode(account_name, connector_name)
@@ -565,10 +562,10 @@ async def get_position_mode(
 
 @router.post("/{account_name}/{connector_name}/leverage")
 async def set_leverage(
-    account_name: str,
+    account_name: ValidAccountDep,
     connector_name: str,
     request: LeverageRequest,
-    accounts_service: AccountsService = Depends(get_accounts_service),
+    accounts_service: AccountsDep,
 ):
     """
     Set leverage for a specific trading pair on a perpetual connector.
@@ -598,7 +595,7 @@ async def set_leverage(
 
 @router.post("/funding-payments", response_model=PaginatedResponse)
 async def get_funding_payments(
-    filter_request: FundingPaymentFilterRequest, accounts_service: AccountsService = Depends(get_accounts_service)
+    filter_request: FundingPaymentFilterRequest, accounts_service: AccountsDep
 ):
     """
     Get funding payment history across all or filtered perpetual connectors.
@@ -616,45 +613,63 @@ async def get_funding_payments(
         HTTPException: 500 if there's an error fetching funding payments
     """
     try:
-        all_funding_payments = []
         all_connectors = accounts_service.connector_manager.get_all_connectors()
 
         # Filter accounts
         accounts_to_check = filter_request.account_names if filter_request.account_names else list(all_connectors.keys())
 
+        # Collect the perpetual connectors to query, grouped by account
+        connectors_by_account = {}
         for account_name in accounts_to_check:
             if account_name in all_connectors:
-                # Filter connectors
-                connectors_to_check = (
-                    filter_request.connector_names
-                    if filter_request.connector_names
-                    else list(all_connectors[account_name].keys())
+                # Only fetch funding payments from perpetual connectors
+                perpetual_connectors = accounts_service.connector_manager.get_perpetual_connectors(account_name)
+                if filter_request.connector_names:
+                    connectors_to_check = [c for c in filter_request.connector_names if c in perpetual_connectors]
+                else:
+                    connectors_to_check = list(perpetual_connectors)
+                if connectors_to_check:
+                    connectors_by_account[account_name] = connectors_to_check
+
+        # Spot-only or unknown accounts have nothing to fetch, skip the gather, merge and pagination
+        if not connectors_by_account:
+            return PaginatedResponse(
+                data=[],
+                pagination={"limit": filter_request.limit, "has_more": False, "next_cursor": None, "total_count": 0},
+            )
+
+        # One query per account covering all of its connectors, accounts fetched concurrently within the
+        # history scan budget
+        async with history_semaphore:
+            results = await asyncio.gather(
+                *[accounts_service.get_funding_payments_multi(
+                    account_name=account_name,
+                    connector_names=connector_names,
+                    trading_pair=filter_request.trading_pair,
+                    limit=filter_request.limit * 2,  # Get more for pagination
+                ) for account_name, connector_names in connectors_by_account.items()],
+                return_exceptions=True
+            )
+        payment_lists = []
+        for account_name, payments in zip(connectors_by_account, results):
+            if isinstance(payments, Exception):
+                # Log error but continue with other accounts
+                logger.warning("Failed to get funding payments for %s: %s", account_name, payments)
+                continue
+            # Add cursor-friendly identifier to each payment
+            for payment in payments:
+                payment["_cursor_id"] = (
+                    f"{account_name}:{payment.get('connector_name', '')}:"
+                    f"{payment.get('timestamp', '')}:{payment.get('trading_pair', '')}"
                 )
+            payment_lists.append(payments)
 
-                for connector_name in connectors_to_check:
-                    # Only fetch funding payments from perpetual connectors
-                    if connector_name in all_connectors[account_name] and "_perpetual" in connector_name:
-                        try:
-                            payments = await accounts_service.get_funding_payments(
-                                account_name=account_name,
-                                connector_name=connector_name,
-                                trading_pair=filter_request.trading_pair,
-                                limit=filter_request.limit * 2,  # Get more for pagination
-                            )
-                            # Add cursor-friendly identifier to each payment
-                            for payment in payments:
-                                payment["_cursor_id"] = (
-                                    f"{account_name}:{connector_name}:{payment.get('timestamp', '')}:{payment.get('trading_pair', '')}"
-                                )
-                            all_funding_payments.extend(payments)
-                        except Exception as e:
-                            # Log error but continue with other connectors
-                            import logging
-
-                            logger.warning(f"Failed to get funding payments for {account_name}/{connector_name}: {e}")
-
-        # Sort by timestamp (most recent first) and then by cursor_id for consistency
-        all_funding_payments.sort(key=lambda x: (x.get("timestamp", ""), x.get("_cursor_id", "")), reverse=True)
+        # Each account's payments are already ordered by timestamp, connector and trading pair (most recent first)
+        # by the database, so a k-way merge gives the same order as sorting by (timestamp, cursor_id) without a
+        # full sort
+        all_funding_payments = list(heapq.merge(
+            *payment_lists, key=lambda x: (x.get("timestamp", ""), x.get("_cursor_id", "")), reverse=True
+        ))
 
         # Apply cursor-based pagination
         start_index = 0
@@ -691,6 +706,22 @@ async def get_funding_payments(
         raise HTTPException(status_code=500, detail=f"Error fetching funding payments: {str(e)}")
 
 
+# Map OrderState to status strings, built once instead of for every order
+_ORDER_STATE_TO_STATUS = {
+    OrderState.PENDING_CREATE: "SUBMITTED",
+    OrderState.OPEN: "OPEN",
+    OrderState.PENDING_CANCEL: "OPEN",  # Still open until cancelled
+    OrderState.CANCELED: "CANCELLED",
+    OrderState.PARTIALLY_FILLED: "PARTIALLY_FILLED",
+    OrderState.FILLED: "FILLED",
+    OrderState.FAILED: "FAILED",
+    OrderState.PENDING_APPROVAL: "SUBMITTED",
+    OrderState.APPROVED: "SUBMITTED",
+    OrderState.CREATED: "SUBMITTED",
+    OrderState.COMPLETED: "FILLED",
+}
+
+
 def _standardize_in_flight_order_response(order, account_name: str, connector_name: str) -> dict:
     """
     Convert a Hummingbot InFlightOrder to standardized format matching the orders search response.
@@ -703,29 +734,10 @@ def _standardize_in_flight_order_response(order, account_name: str, connector_na
     Returns:
         Dictionary with standardized order format
     """
-    # Map OrderState to status strings
-    from hummingbot.core.data_type.in_flight_order import OrderState
-
-    status_mapping = {
-        OrderState.PENDING_CREATE: "SUBMITTED",
-        OrderState.OPEN: "OPEN",
-        OrderState.PENDING_CANCEL: "OPEN",  # Still open until cancelled
-        OrderState.CANCELED: "CANCELLED",
-        OrderState.PARTIALLY_FILLED: "PARTIALLY_FILLED",
-        OrderState.FILLED: "FILLED",
-        OrderState.FAILED: "FAILED",
-        OrderState.PENDING_APPROVAL: "SUBMITTED",
-        OrderState.APPROVED: "SUBMITTED",
-        OrderState.CREATED: "SUBMITTED",
-        OrderState.COMPLETED: "FILLED",
-    }
-
     # Get status string
-    status = status_mapping.get(order.current_state, "SUBMITTED")
+    status = _ORDER_STATE_TO_STATUS.get(order.current_state, "SUBMITTED")
 
     # Convert timestamps to ISO format
-    from datetime import datetime, timezone
-
     created_at = datetime.fromtimestamp(order.creation_timestamp, tz=timezone.utc).isoformat()
     updated_at = datetime.fromtimestamp(
         getattr(order, "last_update_timestamp", order.creation_timestamp), tz=timezone.utc
@@ -11,7 +11,7 @@ if [[ "$1" == "--dev" ]]; then
     docker compose up emqx postgres -d
     source "$(conda info --base)/etc/profile.d/conda.sh"
     conda activate hummingbot-api
-    uvicorn main:app --reload
+    uvicorn main:app --reload --loop uvloop --http httptools
 else
     echo "Running with Docker Compose..."
     docker compose up -d
@@ -1,9 +1,11 @@
 import asyncio
 import logging
+import time
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
+import numpy as np
 from fastapi import HTTPException
 from hummingbot.client.config.config_crypt import ETHKeyFileSecretManger
 from hummingbot.core.data_type.common import OrderType, TradeType, PositionAction, PositionMode
@@ -12,12 +14,29 @@ from hummingbot.strategy_v2.executors.data_types import ConnectorPair
 from config import settings
 from database import AsyncDatabaseManager, AccountRepository, OrderRepository, TradeRepository, FundingRepository
 from services.market_data_feed_manager import MarketDataFeedManager
-from utils.connector_manager import ConnectorManager
+from utils.connector_manager import PERPETUAL_SUFFIXES, ConnectorManager
+from utils.distribution_core import KeyInterner, aggregate, group_keys
 from utils.file_system import fs_util
+from utils.pagination import encode_cursor
 
 # Create module-specific logger
 logger = logging.getLogger(__name__)
 
+_ACCOUNT_NOT_FOUND_TEMPLATE = "Account '{}' not found"
+
+# Accounts that must never be deleted through the API
+PROTECTED_ACCOUNTS: frozenset = frozenset({"master_account"})
+
+
+def protected_account_error(account_name: str) -> HTTPException:
+    """Build the 400 raised when a protected account is targeted for deletion."""
+    return HTTPException(status_code=400, detail=f"Cannot delete protected account '{account_name}'.")
+
+
+def _account_404(account_name: str) -> HTTPException:
+    """Build the 404 raised when an account does not exist."""
+    return HTTPException(status_code=404, detail=_ACCOUNT_NOT_FOUND_TEMPLATE.format(account_name))
+
 
 class AccountsService:
     """
@@ -39,7 +58,8 @@ class AccountsService:
     def __init__(self,
                  account_update_interval: int = 5,
                  default_quote: str = "USDT",
-                 market_data_feed_manager: Optional[MarketDataFeedManager] = None):
+                 market_data_feed_manager: Optional[MarketDataFeedManager] = None,
+                 state_refresh_ttl: float = 10):
         """
         Initialize the AccountsService.
         
@@ -47,10 +67,28 @@ class AccountsService:
             account_update_interval: How often to update account states in minutes (default: 5)
             default_quote: Default quote currency for trading pairs (default: "USDT")
             market_data_feed_manager: Market data feed manager for price caching (optional)
+            state_refresh_ttl: Seconds a request-triggered state refresh is reused (default: 10)
         """
         self.secrets_manager = ETHKeyFileSecretManger(settings.security.config_password)
         self.accounts_state = {}
+        self._accounts = set(self.list_accounts()) if fs_util.path_exists("credentials") else set()
+        self._balances_soa: Optional[Dict[str, any]] = None
+        # Incremented whenever accounts_state changes, used to build ETags for state responses
+        self._state_version = 0
+        # Distribution results for the current state version, shared between requests and never mutated
+        self._distribution_cache: Dict[tuple, Dict[str, any]] = {}
+        # Connector credentials per account, loaded in one directory scan and kept in sync on mutation.
+        # Entries are immutable tuples replaced under the lock, so readers never need to acquire it
+        self._creds_by_account: Dict[str, Tuple[str, ...]] = (
+            fs_util.scan_nested_files("credentials", "connectors", ".yml")
+            if fs_util.path_exists("credentials") else {}
+        )
+        self._credentials_lock = asyncio.Lock()
         self.update_account_state_interval = account_update_interval * 60
+        self.state_refresh_ttl = state_refresh_ttl
+        # Monotonic time of the last balance refresh, shared by the update loop and request-triggered refreshes
+        self._state_refreshed_at = 0.0
+        self._state_refresh_lock = asyncio.Lock()
         self.default_quote = default_quote
         self.market_data_feed_manager = market_data_feed_manager
         self._update_account_state_task: Optional[asyncio.Task] = None
@@ -71,6 +109,22 @@ class AccountsService:
     def get_accounts_state(self):
         return self.accounts_state
 
+    def get_state_version(self) -> int:
+        """
+        Get the current version of the accounts state. It changes every time the state is modified.
+        :return: The state version counter.
+        """
+        return self._state_version
+
+    def account_exists(self, account_name: str) -> bool:
+        """
+        Check if an account exists using the cached set of account names.
+        The set is kept in sync by add_account, delete_account and the periodic connector check.
+        :param account_name: The name of the account.
+        :return: True if the account exists, False otherwise.
+        """
+        return account_name in self._accounts
+
     def get_default_market(self, token: str, connector_name: str) -> str:
         if token.startswith("LD") and token != "LDO":
             # These tokens are staked in binance earn
@@ -151,11 +205,13 @@ class AccountsService:
 
     async def load_account_state_history(self, 
                                         limit: Optional[int] = None,
-                                        cursor: Optional[str] = None,
+                                        cursor_ts: Optional[datetime] = None,
+                                        cursor_id: Optional[int] = None,
                                         start_time: Optional[datetime] = None,
-                                        end_time: Optional[datetime] = None):
+                                        end_time: Optional[datetime] = None,
+                                        account_names: Optional[List[str]] = None):
         """
-        Load the account state history from the database with pagination.
+        Load the account state history of all or the given accounts from the database with keyset pagination.
         :return: Tuple of (data, next_cursor, has_more).
         """
         await self.ensure_db_initialized()
@@ -165,22 +221,53 @@ class AccountsService:
                 repository = AccountRepository(session)
                 return await repository.get_account_state_history(
                     limit=limit,
-                    cursor=cursor,
+                    cursor_ts=cursor_ts,
+                    cursor_id=cursor_id,
                     start_time=start_time,
-                    end_time=end_time
+                    end_time=end_time,
+                    account_names=account_names
                 )
         except Exception as e:
             logger.error(f"Error loading account state history from database: {e}")
             # Return empty result since we no longer have a fallback
             return [], None, False
 
+    async def iter_account_state_history(self,
+                                         limit: Optional[int] = None,
+                                         account_names: Optional[List[str]] = None,
+                                         connector_names: Optional[List[str]] = None,
+                                         cursor_ts: Optional[datetime] = None,
+                                         cursor_id: Optional[int] = None,
+                                         start_time: Optional[datetime] = None,
+                                         end_time: Optional[datetime] = None) -> AsyncIterator[Dict]:
+        """
+        Stream the account state history from the database one minute group at a time.
+        :return: Async iterator of history items with timestamp and state.
+        """
+        await self.ensure_db_initialized()
+
+        async with self.db_manager.get_session_context() as session:
+            repository = AccountRepository(session)
+            async for item in repository.iter_account_state_history(
+                limit=limit,
+                account_names=account_names,
+                connector_names=connector_names,
+                cursor_ts=cursor_ts,
+                cursor_id=cursor_id,
+                start_time=start_time,
+                end_time=end_time
+            ):
+                yield item
+
     async def check_all_connectors(self):
         """
         Check all available credentials for all accounts and ensure connectors are initialized.
         This method is idempotent - it only initializes missing connectors.
         """
-        for account_name in self.list_accounts():
-            await self._ensure_account_connectors_initialized(account_name)
+        self._accounts = set(self.list_accounts())
+        # Initializing a connector waits on its exchange (balances, trading rules), so accounts are set up concurrently
+        await asyncio.gather(*[self._ensure_account_connectors_initialized(account_name)
+                               for account_name in self._accounts])
 
     async def _ensure_account_connectors_initialized(self, account_name: str):
         """
@@ -189,15 +276,18 @@ class AccountsService:
         
         :param account_name: The name of the account to initialize connectors for.
         """
-        # Initialize missing connectors
-        for connector_name in self.connector_manager.list_available_credentials(account_name):
-            try:
-                # Only initialize if connector doesn't exist
-                if not self.connector_manager.is_connector_initialized(account_name, connector_name):
-                    # Get connector will now handle all initialization
-                    await self.connector_manager.get_connector(account_name, connector_name)
-            except Exception as e:
-                logger.error(f"Error initializing connector {connector_name} for account {account_name}: {e}")
+        # Only initialize connectors that don't exist yet
+        missing_connectors = [connector_name
+                              for connector_name in self.connector_manager.list_available_credentials(account_name)
+                              if not self.connector_manager.is_connector_initialized(account_name, connector_name)]
+        # Get connector will now handle all initialization, run concurrently so exchange round trips overlap
+        results = await asyncio.gather(
+            *[self.connector_manager.get_connector(account_name, connector_name) for connector_name in missing_connectors],
+            return_exceptions=True
+        )
+        for connector_name, result in zip(missing_connectors, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error initializing connector {connector_name} for account {account_name}: {result}")
 
     def _initialize_rate_sources_for_pairs(self, connector_name: str, trading_pairs: List[str]):
         """
@@ -246,17 +336,46 @@ class AccountsService:
     async def update_account_state(self):
         """Update account state for all connectors."""
         all_connectors = self.connector_manager.get_all_connectors()
+        state_changed = False
         
-        for account_name, connectors in all_connectors.items():
+        for account_name in all_connectors:
             if account_name not in self.accounts_state:
                 self.accounts_state[account_name] = {}
-            for connector_name, connector in connectors.items():
-                try:
-                    tokens_info = await self._get_connector_tokens_info(connector, connector_name, self.market_data_feed_manager)
-                    self.accounts_state[account_name][connector_name] = tokens_info
-                except Exception as e:
-                    logger.error(f"Error updating balances for connector {connector_name} in account {account_name}: {e}")
-                    self.accounts_state[account_name][connector_name] = []
+                state_changed = True
+
+        # Fetch the balances of all connectors concurrently, each one may wait on its own exchange and price source
+        connector_keys = [(account_name, connector_name)
+                          for account_name, connectors in all_connectors.items()
+                          for connector_name in connectors]
+        results = await asyncio.gather(
+            *[self._get_connector_tokens_info(all_connectors[account_name][connector_name], connector_name,
+                                              self.market_data_feed_manager)
+              for account_name, connector_name in connector_keys],
+            return_exceptions=True
+        )
+        for (account_name, connector_name), tokens_info in zip(connector_keys, results):
+            if isinstance(tokens_info, Exception):
+                logger.error(f"Error updating balances for connector {connector_name} in account {account_name}: {tokens_info}")
+                tokens_info = []
+            if self.accounts_state[account_name].get(connector_name) != tokens_info:
+                self.accounts_state[account_name][connector_name] = tokens_info
+                state_changed = True
+        # Only bump the state version when balances actually changed so ETags stay valid between polls
+        if state_changed:
+            self._invalidate_balances_soa()
+        self._state_refreshed_at = time.monotonic()
+
+    async def refresh_account_state(self):
+        """
+        Refresh the account state for a request unless it was refreshed within the last state_refresh_ttl seconds.
+        Concurrent callers wait for a single refresh instead of each fetching the balances of every connector.
+        """
+        if time.monotonic() - self._state_refreshed_at < self.state_refresh_ttl:
+            return
+        async with self._state_refresh_lock:
+            if time.monotonic() - self._state_refreshed_at < self.state_refresh_ttl:
+                return
+            await self.update_account_state()
 
     async def _get_connector_tokens_info(self, connector, connector_name: str, market_data_manager: Optional[MarketDataFeedManager] = None) -> List[Dict]:
         """Get token info from a connector instance using cached prices when available."""
@@ -351,9 +470,19 @@ class AccountsService:
         """
         return self.connector_manager.get_connector_config_map(connector_name)
 
+    def credentials_exist(self, account_name: str, connector_name: str) -> bool:
+        """
+        Check if credentials are stored for the specified connector and account.
+        :param account_name: The name of the account.
+        :param connector_name: The name of the connector.
+        :return: True if the credentials file exists, False otherwise.
+        """
+        return fs_util.path_exists(f"credentials/{account_name}/connectors/{connector_name}.yml")
+
     async def add_credentials(self, account_name: str, connector_name: str, credentials: dict):
         """
         Add or update connector credentials and initialize the connector with validation.
+        The caller is responsible for rolling back credentials written by a failed call.
         
         :param account_name: The name of the account.
         :param connector_name: The name of the connector.
@@ -363,6 +492,7 @@ class AccountsService:
         try:
             # Update the connector keys (this saves the credentials to file and validates them)
             connector = await self.connector_manager.update_connector_keys(account_name, connector_name, credentials)
+            await self._set_credentials_snapshot(account_name, connector_name, present=True)
             
             # Initialize price tracking for this connector's tokens if market data manager is available
             if self.market_data_feed_manager:
@@ -371,7 +501,7 @@ class AccountsService:
             await self.update_account_state()
         except Exception as e:
             logger.error(f"Error adding connector credentials for account {account_name}: {e}")
-            await self.delete_credentials(account_name, connector_name)
+            self._creds_by_account.pop(account_name, None)
             raise e
 
     @staticmethod
@@ -382,18 +512,38 @@ class AccountsService:
         """
         return fs_util.list_folders('credentials')
 
-    @staticmethod
-    def list_credentials(account_name: str):
+    def list_credentials(self, account_name: str) -> Tuple[str, ...]:
         """
         List all the credentials that are connected to the specified account.
         :param account_name: The name of the account.
-        :return: List of credentials.
+        :return: Tuple of connector names with credentials, without the .yml extension.
         """
-        try:
-            return [file for file in fs_util.list_files(f'credentials/{account_name}/connectors') if
-                    file.endswith('.yml')]
-        except FileNotFoundError as e:
-            raise HTTPException(status_code=404, detail=str(e))
+        credentials = self._creds_by_account.get(account_name)
+        if credentials is None:
+            try:
+                credentials = tuple(file[:-len('.yml')] for file in fs_util.list_files(f'credentials/{account_name}/connectors')
+                                    if file.endswith('.yml'))
+            except FileNotFoundError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            self._creds_by_account[account_name] = credentials
+        return credentials
+
+    async def _set_credentials_snapshot(self, account_name: str, connector_name: str, present: bool):
+        """
+        Add or remove a connector from the in-memory credentials snapshot of an account.
+        :param account_name: The name of the account.
+        :param connector_name: The name of the connector.
+        :param present: True if the connector credentials were stored, False if they were removed.
+        """
+        async with self._credentials_lock:
+            credentials = self._creds_by_account.get(account_name)
+            if credentials is None:
+                # Not loaded yet, the next read scans the account folder
+                return
+            if present and connector_name not in credentials:
+                self._creds_by_account[account_name] = credentials + (connector_name,)
+            elif not present:
+                self._creds_by_account[account_name] = tuple(c for c in credentials if c != connector_name)
 
     async def delete_credentials(self, account_name: str, connector_name: str):
         """
@@ -403,7 +553,10 @@ class AccountsService:
         :return:
         """
         if fs_util.path_exists(f"credentials/{account_name}/connectors/{connector_name}.yml"):
-            fs_util.delete_file(directory=f"credentials/{account_name}/connectors", file_name=f"{connector_name}.yml")
+            # Update the in-memory snapshot first and remove the file off the event loop
+            await self._set_credentials_snapshot(account_name, connector_name, present=False)
+            await asyncio.to_thread(fs_util.delete_file, directory=f"credentials/{account_name}/connectors",
+                                    file_name=f"{connector_name}.yml")
             
             # Stop the connector if it's running
             await self.connector_manager.stop_connector(account_name, connector_name)
@@ -411,28 +564,45 @@ class AccountsService:
             # Remove from account state
             if account_name in self.accounts_state and connector_name in self.accounts_state[account_name]:
                 self.accounts_state[account_name].pop(connector_name)
+                self._invalidate_balances_soa()
             
             # Clear the connector from cache
             self.connector_manager.clear_cache(account_name, connector_name)
 
-    def add_account(self, account_name: str):
+    async def add_account(self, account_name: str):
         """
         Add a new account.
         :param account_name:
         :return:
         """
-        # Check if account already exists by looking at folders
-        if account_name in self.list_accounts():
+        # Check if account already exists
+        if self.account_exists(account_name):
             raise HTTPException(status_code=400, detail="Account already exists.")
         
+        # Reserve the name before yielding to the thread so a concurrent request for it is rejected
+        self._accounts.add(account_name)
+        try:
+            await asyncio.to_thread(self._create_account_files, account_name)
+        except Exception:
+            self._accounts.discard(account_name)
+            raise
+        
+        # Initialize account state
+        self.accounts_state[account_name] = {}
+        self._creds_by_account[account_name] = ()
+        self._invalidate_balances_soa()
+
+    @staticmethod
+    def _create_account_files(account_name: str):
+        """
+        Create the account folders and copy the default configuration files from the master account.
+        :param account_name: The name of the account.
+        """
         files_to_copy = ["conf_client.yml", "conf_fee_overrides.yml", "hummingbot_logs.yml", ".password_verification"]
         fs_util.create_folder('credentials', account_name)
         fs_util.create_folder(f'credentials/{account_name}', "connectors")
         for file in files_to_copy:
             fs_util.copy_file(f"credentials/master_account/{file}", f"credentials/{account_name}/{file}")
-        
-        # Initialize account state
-        self.accounts_state[account_name] = {}
 
     async def delete_account(self, account_name: str):
         """
@@ -440,16 +610,21 @@ class AccountsService:
         :param account_name:
         :return:
         """
+        if account_name in PROTECTED_ACCOUNTS:
+            raise protected_account_error(account_name)
         # Stop all connectors for this account
         for connector_name in self.connector_manager.list_account_connectors(account_name):
             await self.connector_manager.stop_connector(account_name, connector_name)
         
-        # Delete account folder
-        fs_util.delete_folder('credentials', account_name)
+        # Delete account folder off the event loop
+        await asyncio.to_thread(fs_util.delete_folder, 'credentials', account_name)
+        self._accounts.discard(account_name)
+        self._creds_by_account.pop(account_name, None)
         
         # Remove from account state
         if account_name in self.accounts_state:
             self.accounts_state.pop(account_name)
+            self._invalidate_balances_soa()
         
         # Clear all connectors for this account from cache
         self.connector_manager.clear_cache(account_name)
@@ -472,7 +647,8 @@ class AccountsService:
     async def get_account_state_history(self, 
                                         account_name: str, 
                                         limit: Optional[int] = None,
-                                        cursor: Optional[str] = None,
+                                        cursor_ts: Optional[datetime] = None,
+                                        cursor_id: Optional[int] = None,
                                         start_time: Optional[datetime] = None,
                                         end_time: Optional[datetime] = None):
         """
@@ -486,7 +662,8 @@ class AccountsService:
                 return await repository.get_account_state_history(
                     account_name=account_name, 
                     limit=limit,
-                    cursor=cursor,
+                    cursor_ts=cursor_ts,
+                    cursor_id=cursor_id,
                     start_time=start_time,
                     end_time=end_time
                 )
@@ -513,7 +690,8 @@ class AccountsService:
                                           account_name: str, 
                                           connector_name: str, 
                                           limit: Optional[int] = None,
-                                          cursor: Optional[str] = None,
+                                          cursor_ts: Optional[datetime] = None,
+                                          cursor_id: Optional[int] = None,
                                           start_time: Optional[datetime] = None,
                                           end_time: Optional[datetime] = None):
         """
@@ -528,7 +706,8 @@ class AccountsService:
                     account_name=account_name, 
                     connector_name=connector_name,
                     limit=limit,
-                    cursor=cursor,
+                    cursor_ts=cursor_ts,
+                    cursor_id=cursor_id,
                     start_time=start_time,
                     end_time=end_time
                 )
@@ -598,99 +777,142 @@ class AccountsService:
             
             return portfolio
     
-    def get_portfolio_distribution(self, account_name: Optional[str] = None) -> Dict[str, any]:
+    def _invalidate_balances_soa(self):
+        """
+        Drop the cached structure-of-arrays view and distribution results so they are rebuilt from the account
+        state on next use, and bump the state version since every caller has just modified the account state.
+        """
+        self._balances_soa = None
+        self._distribution_cache.clear()
+        self._state_version += 1
+
+    def _get_balances_soa(self) -> Dict[str, any]:
         """
-        Get portfolio distribution by tokens with percentages.
+        Get all balances as structure-of-arrays columns (token_id, account_id, connector_id, value, units).
+        The columns are built once per account state update and reused by the distribution endpoints.
         """
+        if self._balances_soa is None:
+            tokens = KeyInterner()
+            accounts = KeyInterner()
+            connectors = KeyInterner()
+            account_connectors = KeyInterner()
+            token_ids, account_ids, connector_ids, values, units = [], [], [], [], []
+            
+            for acc_name, account_data in self.accounts_state.items():
+                account_id = accounts.intern(acc_name)
+                for connector_name, connector_data in account_data.items():
+                    connector_id = connectors.intern(connector_name)
+                    account_connectors.intern((acc_name, connector_name))
+                    for token_info in connector_data:
+                        token_ids.append(tokens.intern(token_info.get("token", "")))
+                        account_ids.append(account_id)
+                        connector_ids.append(connector_id)
+                        values.append(token_info.get("value", 0))
+                        units.append(token_info.get("units", 0))
+            
+            self._balances_soa = {
+                "tokens": tokens,
+                "accounts": accounts,
+                "connectors": connectors,
+                "account_connectors": account_connectors,
+                "token_id": np.asarray(token_ids, dtype=np.int64),
+                "account_id": np.asarray(account_ids, dtype=np.int64),
+                "connector_id": np.asarray(connector_ids, dtype=np.int64),
+                "value": np.asarray(values, dtype=np.float64),
+                "units": np.asarray(units, dtype=np.float64),
+            }
+        return self._balances_soa
+
+    def get_portfolio_distribution(self, account_name: Optional[str] = None,
+                                   account_names: Optional[List[str]] = None) -> Dict[str, any]:
+        """
+        Get portfolio distribution by tokens with percentages, for all accounts, one account or a set of accounts.
+        The result is cached until the account state changes.
+        """
+        # None means all accounts, while an empty list of names selects no account at all
+        if account_name:
+            account_filter, filter_label = (account_name,), account_name
+        elif account_names is not None:
+            account_filter = tuple(dict.fromkeys(account_names))
+            filter_label = list(account_filter)
+        else:
+            account_filter, filter_label = None, "all_accounts"
+        cache_key = ("portfolio", account_filter)
+        cached = self._distribution_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            # Get accounts to process
-            accounts_to_process = [account_name] if account_name else list(self.accounts_state.keys())
+            soa = self._get_balances_soa()
+            tokens, accounts = soa["tokens"], soa["accounts"]
+            token_ids, account_ids, connector_ids = soa["token_id"], soa["account_id"], soa["connector_id"]
+            values, units = soa["value"], soa["units"]
             
-            # Aggregate all tokens across accounts and connectors
-            token_values = {}
-            total_value = 0
+            # Restrict the columns to the requested accounts
+            if account_filter is not None:
+                mask = np.isin(account_ids, [accounts.ids.get(name, -1) for name in account_filter])
+                token_ids, account_ids, connector_ids = token_ids[mask], account_ids[mask], connector_ids[mask]
+                values, units = values[mask], units[mask]
             
-            for acc_name in accounts_to_process:
-                if acc_name in self.accounts_state:
-                    for connector_name, connector_data in self.accounts_state[acc_name].items():
-                        for token_info in connector_data:
-                            token = token_info.get("token", "")
-                            value = token_info.get("value", 0)
-                            
-                            if token not in token_values:
-                                token_values[token] = {
-                                    "token": token,
-                                    "total_value": 0,
-                                    "total_units": 0,
-                                    "accounts": {}
-                                }
-                            
-                            token_values[token]["total_value"] += value
-                            token_values[token]["total_units"] += token_info.get("units", 0)
-                            total_value += value
-                            
-                            # Track by account
-                            if acc_name not in token_values[token]["accounts"]:
-                                token_values[token]["accounts"][acc_name] = {
-                                    "value": 0,
-                                    "units": 0,
-                                    "connectors": {}
-                                }
-                            
-                            token_values[token]["accounts"][acc_name]["value"] += value
-                            token_values[token]["accounts"][acc_name]["units"] += token_info.get("units", 0)
-                            
-                            # Track by connector within account
-                            if connector_name not in token_values[token]["accounts"][acc_name]["connectors"]:
-                                token_values[token]["accounts"][acc_name]["connectors"][connector_name] = {
-                                    "value": 0,
-                                    "units": 0
-                                }
-                            
-                            token_values[token]["accounts"][acc_name]["connectors"][connector_name]["value"] += value
-                            token_values[token]["accounts"][acc_name]["connectors"][connector_name]["units"] += token_info.get("units", 0)
+            n_accounts, n_connectors = len(accounts), len(soa["connectors"])
+            total_value = float(values.sum())
             
-            # Calculate percentages
-            distribution = []
-            for token_data in token_values.values():
-                percentage = (token_data["total_value"] / total_value * 100) if total_value > 0 else 0
-                
-                token_dist = {
-                    "token": token_data["token"],
-                    "total_value": round(token_data["total_value"], 6),
-                    "total_units": token_data["total_units"],
-                    "percentage": round(percentage, 4),
+            # Aggregate values and units at token, account and connector level using composite keys
+            token_keys, token_groups = group_keys(token_ids)
+            token_values, token_percentages = aggregate(values, token_groups, len(token_keys))
+            token_units, _ = aggregate(units, token_groups, len(token_keys))
+            
+            account_keys, account_groups = group_keys(token_ids * n_accounts + account_ids)
+            account_values, account_percentages = aggregate(values, account_groups, len(account_keys))
+            account_units, _ = aggregate(units, account_groups, len(account_keys))
+            
+            connector_keys, connector_groups = group_keys((token_ids * n_accounts + account_ids) * n_connectors + connector_ids)
+            connector_values, _ = aggregate(values, connector_groups, len(connector_keys))
+            connector_units, _ = aggregate(units, connector_groups, len(connector_keys))
+            
+            # Build the nested response from the aggregated arrays
+            token_dists = {}
+            for i, token_id in enumerate(token_keys):
+                token = tokens.keys[token_id]
+                token_dists[token] = {
+                    "token": token,
+                    "total_value": round(float(token_values[i]), 6),
+                    "total_units": float(token_units[i]),
+                    "percentage": round(float(token_percentages[i]), 4),
                     "accounts": {}
                 }
-                
-                # Add account-level percentages
-                for acc_name, acc_data in token_data["accounts"].items():
-                    acc_percentage = (acc_data["value"] / total_value * 100) if total_value > 0 else 0
-                    token_dist["accounts"][acc_name] = {
-                        "value": round(acc_data["value"], 6),
-                        "units": acc_data["units"],
-                        "percentage": round(acc_percentage, 4),
-                        "connectors": {}
-                    }
-                    
-                    # Add connector-level data
-                    for conn_name, conn_data in acc_data["connectors"].items():
-                        token_dist["accounts"][acc_name]["connectors"][conn_name] = {
-                            "value": round(conn_data["value"], 6),
-                            "units": conn_data["units"]
-                        }
-                
-                distribution.append(token_dist)
+            
+            for i, key in enumerate(account_keys):
+                token_id, account_id = divmod(int(key), n_accounts)
+                token_dists[tokens.keys[token_id]]["accounts"][accounts.keys[account_id]] = {
+                    "value": round(float(account_values[i]), 6),
+                    "units": float(account_units[i]),
+                    "percentage": round(float(account_percentages[i]), 4),
+                    "connectors": {}
+                }
+            
+            for i, key in enumerate(connector_keys):
+                token_account_key, connector_id = divmod(int(key), n_connectors)
+                token_id, account_id = divmod(token_account_key, n_accounts)
+                token_accounts = token_dists[tokens.keys[token_id]]["accounts"]
+                token_accounts[accounts.keys[account_id]]["connectors"][soa["connectors"].keys[connector_id]] = {
+                    "value": round(float(connector_values[i]), 6),
+                    "units": float(connector_units[i])
+                }
+            
+            distribution = list(token_dists.values())
             
             # Sort by value (descending)
             distribution.sort(key=lambda x: x["total_value"], reverse=True)
             
-            return {
+            result = {
                 "total_portfolio_value": round(total_value, 6),
                 "token_count": len(distribution),
                 "distribution": distribution,
-                "account_filter": account_name if account_name else "all_accounts"
+                "account_filter": filter_label
             }
+            self._distribution_cache[cache_key] = result
+            return result
             
         except Exception as e:
             logger.error(f"Error calculating portfolio distribution: {e}")
@@ -698,65 +920,60 @@ class AccountsService:
                 "total_portfolio_value": 0,
                 "token_count": 0,
                 "distribution": [],
-                "account_filter": account_name if account_name else "all_accounts",
+                "account_filter": filter_label,
                 "error": str(e)
             }
     
     def get_account_distribution(self) -> Dict[str, any]:
         """
         Get portfolio distribution by accounts with percentages.
+        The result is cached until the account state changes.
         """
+        cached = self._distribution_cache.get(("accounts",))
+        if cached is not None:
+            return cached
+        
         try:
-            account_values = {}
-            total_value = 0
+            soa = self._get_balances_soa()
+            accounts, connectors = soa["accounts"], soa["connectors"]
+            n_connectors = len(connectors)
+            values = soa["value"]
+            total_value = float(values.sum())
             
-            for acc_name, account_data in self.accounts_state.items():
-                account_value = 0
-                connector_values = {}
-                
-                for connector_name, connector_data in account_data.items():
-                    connector_value = 0
-                    for token_info in connector_data:
-                        value = token_info.get("value", 0)
-                        connector_value += value
-                        account_value += value
-                    
-                    connector_values[connector_name] = round(connector_value, 6)
-                
-                account_values[acc_name] = {
-                    "total_value": round(account_value, 6),
-                    "connectors": connector_values
-                }
-                total_value += account_value
+            account_values, account_percentages = aggregate(values, soa["account_id"], len(accounts))
+            connector_values, connector_percentages = aggregate(
+                values, soa["account_id"] * n_connectors + soa["connector_id"], len(accounts) * n_connectors
+            )
             
-            # Calculate percentages
-            distribution = []
-            for acc_name, acc_data in account_values.items():
-                percentage = (acc_data["total_value"] / total_value * 100) if total_value > 0 else 0
-                
-                connector_dist = {}
-                for conn_name, conn_value in acc_data["connectors"].items():
-                    conn_percentage = (conn_value / total_value * 100) if total_value > 0 else 0
-                    connector_dist[conn_name] = {
-                        "value": conn_value,
-                        "percentage": round(conn_percentage, 4)
-                    }
-                
-                distribution.append({
+            # Build the response from the aggregated arrays
+            account_dists = {}
+            for i, acc_name in enumerate(accounts.keys):
+                account_dists[acc_name] = {
                     "account": acc_name,
-                    "total_value": acc_data["total_value"],
-                    "percentage": round(percentage, 4),
-                    "connectors": connector_dist
-                })
+                    "total_value": round(float(account_values[i]), 6),
+                    "percentage": round(float(account_percentages[i]), 4),
+                    "connectors": {}
+                }
+            
+            for acc_name, conn_name in soa["account_connectors"].keys:
+                i = accounts.ids[acc_name] * n_connectors + connectors.ids[conn_name]
+                account_dists[acc_name]["connectors"][conn_name] = {
+                    "value": round(float(connector_values[i]), 6),
+                    "percentage": round(float(connector_percentages[i]), 4)
+                }
+            
+            distribution = list(account_dists.values())
             
             # Sort by value (descending)
             distribution.sort(key=lambda x: x["total_value"], reverse=True)
             
-            return {
+            result = {
                 "total_portfolio_value": round(total_value, 6),
                 "account_count": len(distribution),
                 "distribution": distribution
             }
+            self._distribution_cache[("accounts",)] = result
+            return result
             
         except Exception as e:
             logger.error(f"Error calculating account distribution: {e}")
@@ -792,8 +1009,8 @@ class AccountsService:
             HTTPException: If account, connector not found, or trade fails
         """
         # Validate account exists
-        if account_name not in self.list_accounts():
-            raise HTTPException(status_code=404, detail=f"Account '{account_name}' not found")
+        if not self.account_exists(account_name):
+            raise _account_404(account_name)
         
         # Validate connector exists for account
         if not self.connector_manager.is_connector_initialized(account_name, connector_name):
@@ -813,8 +1030,9 @@ class AccountsService:
                 detail=f"Trading rules not yet loaded for {connector_name}. Please try again in a moment."
             )
         
-        # Validate trading pair and get trading rule
-        if trading_pair not in connector.trading_rules:
+        # Validate trading pair and get trading rule with a single lookup
+        trading_rule = connector.trading_rules.get(trading_pair)
+        if trading_rule is None:
             available_pairs = list(connector.trading_rules.keys())[:10]  # Show first 10
             more_text = f" (and {len(connector.trading_rules) - 10} more)" if len(connector.trading_rules) > 10 else ""
             raise HTTPException(
@@ -823,8 +1041,6 @@ class AccountsService:
                        f"Available pairs: {available_pairs}{more_text}"
             )
         
-        trading_rule = connector.trading_rules[trading_pair]
-        
         # Validate order type is supported
         if order_type not in connector.supported_order_types():
             supported_types = [ot.name for ot in connector.supported_order_types()]
@@ -908,12 +1124,11 @@ class AccountsService:
         Raises:
             HTTPException: If account or connector not found
         """
-        if account_name not in self.list_accounts():
-            raise HTTPException(status_code=404, detail=f"Account '{account_name}' not found")
+        if not self.account_exists(account_name):
+            raise _account_404(account_name)
         
-        # Check if connector credentials exist
-        available_credentials = self.connector_manager.list_available_credentials(account_name)
-        if connector_name not in available_credentials:
+        # Check the in-memory credentials snapshot instead of listing the credentials folder on every call
+        if connector_name not in self.list_credentials(account_name):
             raise HTTPException(status_code=404, detail=f"Connector '{connector_name}' not found for account '{account_name}'")
         
         return await self.connector_manager.get_connector(account_name, connector_name)
@@ -979,7 +1194,7 @@ class AccountsService:
             HTTPException: If account/connector not found, not perpetual, or operation fails
         """
         # Validate this is a perpetual connector
-        if "_perpetual" not in connector_name:
+        if not connector_name.endswith(PERPETUAL_SUFFIXES):
             raise HTTPException(status_code=400, detail=f"Connector '{connector_name}' is not a perpetual connector")
         
         connector = await self.get_connector_instance(account_name, connector_name)
@@ -1015,7 +1230,7 @@ class AccountsService:
             HTTPException: If account/connector not found, not perpetual, or operation fails
         """
         # Validate this is a perpetual connector
-        if "_perpetual" not in connector_name:
+        if not connector_name.endswith(PERPETUAL_SUFFIXES):
             raise HTTPException(status_code=400, detail=f"Connector '{connector_name}' is not a perpetual connector")
         
         connector = await self.get_connector_instance(account_name, connector_name)
@@ -1059,7 +1274,7 @@ class AccountsService:
             HTTPException: If account/connector not found, not perpetual, or operation fails
         """
         # Validate this is a perpetual connector
-        if "_perpetual" not in connector_name:
+        if not connector_name.endswith(PERPETUAL_SUFFIXES):
             raise HTTPException(status_code=400, detail=f"Connector '{connector_name}' is not a perpetual connector")
         
         connector = await self.get_connector_instance(account_name, connector_name)
@@ -1080,30 +1295,74 @@ class AccountsService:
             logger.error(f"Failed to get position mode: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to get position mode: {str(e)}")
 
-    async def get_orders(self, account_name: Optional[str] = None, connector_name: Optional[str] = None,
-                        trading_pair: Optional[str] = None, status: Optional[str] = None,
+    async def get_orders(self, account_names: Optional[List[str]] = None, connector_names: Optional[List[str]] = None,
+                        trading_pairs: Optional[List[str]] = None, status: Optional[str] = None,
                         start_time: Optional[int] = None, end_time: Optional[int] = None,
-                        limit: int = 100, offset: int = 0) -> List[Dict]:
-        """Get order history using OrderRepository."""
+                        limit: int = 100, cursor_ts: Optional[datetime] = None,
+                        cursor_id: Optional[int] = None) -> Tuple[List[Dict], Optional[str], bool, int]:
+        """
+        Get a page of order history using OrderRepository with keyset pagination.
+        :return: Tuple of (orders, next cursor, whether more orders exist, total orders matching the filters).
+        """
         await self.ensure_db_initialized()
         
         try:
             async with self.db_manager.get_session_context() as session:
                 order_repo = OrderRepository(session)
+                # Fetch one extra row to know whether another page exists
                 orders = await order_repo.get_orders(
-                    account_name=account_name,
-                    connector_name=connector_name,
-                    trading_pair=trading_pair,
+                    account_names=account_names,
+                    connector_names=connector_names,
+                    trading_pairs=trading_pairs,
                     status=status,
                     start_time=start_time,
                     end_time=end_time,
-                    limit=limit,
-                    offset=offset
+                    limit=limit + 1,
+                    cursor_ts=cursor_ts,
+                    cursor_id=cursor_id
                 )
-                return [order_repo.to_dict(order) for order in orders]
+                has_more = len(orders) > limit
+                orders = orders[:limit]
+                next_cursor = encode_cursor(orders[-1].created_at, orders[-1].id) if has_more else None
+                total_count = await order_repo.count_orders(
+                    account_names=account_names,
+                    connector_names=connector_names,
+                    trading_pairs=trading_pairs,
+                    status=status,
+                    start_time=start_time,
+                    end_time=end_time
+                )
+                return [order_repo.to_dict(order) for order in orders], next_cursor, has_more, total_count
         except Exception as e:
             logger.error(f"Error getting orders: {e}")
-            return []
+            return [], None, False, 0
+
+    async def iter_orders(self, account_names: Optional[List[str]] = None,
+                          connector_names: Optional[List[str]] = None,
+                          trading_pairs: Optional[List[str]] = None, status: Optional[str] = None,
+                          start_time: Optional[int] = None, end_time: Optional[int] = None,
+                          limit: Optional[int] = None, cursor_ts: Optional[datetime] = None,
+                          cursor_id: Optional[int] = None) -> AsyncIterator[Dict]:
+        """
+        Stream order history from the database one order at a time.
+        :return: Async iterator of order dictionaries.
+        """
+        await self.ensure_db_initialized()
+
+        async with self.db_manager.get_session_context() as session:
+            order_repo = OrderRepository(session)
+            async for order in order_repo.iter_orders(
+                account_names=account_names,
+                connector_names=connector_names,
+                trading_pairs=trading_pairs,
+                status=status,
+                start_time=start_time,
+                end_time=end_time,
+                limit=limit,
+                cursor_ts=cursor_ts,
+                cursor_id=cursor_id
+            ):
+                yield order_repo.to_dict(order)
 
     async def get_active_orders_history(self, account_name: Optional[str] = None, connector_name: Optional[str] = None,
                                        trading_pair: Optional[str] = None) -> List[Dict]:
@@ -1147,30 +1406,78 @@ class AccountsService:
                 "fill_rate": 0,
             }
 
-    async def get_trades(self, account_name: Optional[str] = None, connector_name: Optional[str] = None,
-                        trading_pair: Optional[str] = None, trade_type: Optional[str] = None,
+    async def get_trades(self, account_names: Optional[List[str]] = None, connector_names: Optional[List[str]] = None,
+                        trading_pairs: Optional[List[str]] = None, trade_types: Optional[List[str]] = None,
                         start_time: Optional[int] = None, end_time: Optional[int] = None,
-                        limit: int = 100, offset: int = 0) -> List[Dict]:
-        """Get trade history using TradeRepository."""
+                        limit: int = 100, cursor_ts: Optional[datetime] = None,
+                        cursor_id: Optional[int] = None) -> Tuple[List[Dict], Optional[str], bool, int]:
+        """
+        Get a page of trade history using TradeRepository with keyset pagination.
+        :return: Tuple of (trades, next cursor, whether more trades exist, total trades matching the filters).
+        """
         await self.ensure_db_initialized()
         
         try:
             async with self.db_manager.get_session_context() as session:
                 trade_repo = TradeRepository(session)
+                # Fetch one extra row to know whether another page exists
                 trade_order_pairs = await trade_repo.get_trades_with_orders(
-                    account_name=account_name,
-                    connector_name=connector_name,
-                    trading_pair=trading_pair,
-                    trade_type=trade_type,
+                    account_names=account_names,
+                    connector_names=connector_names,
+                    trading_pairs=trading_pairs,
+                    trade_types=trade_types,
                     start_time=start_time,
                     end_time=end_time,
-                    limit=limit,
-                    offset=offset
+                    limit=limit + 1,
+                    cursor_ts=cursor_ts,
+                    cursor_id=cursor_id
+                )
+                has_more = len(trade_order_pairs) > limit
+                trade_order_pairs = trade_order_pairs[:limit]
+                next_cursor = None
+                if has_more:
+                    last_trade = trade_order_pairs[-1][0]
+                    next_cursor = encode_cursor(last_trade.timestamp, last_trade.id)
+                total_count = await trade_repo.count_trades_with_orders(
+                    account_names=account_names,
+                    connector_names=connector_names,
+                    trading_pairs=trading_pairs,
+                    trade_types=trade_types,
+                    start_time=start_time,
+                    end_time=end_time
                 )
-                return [trade_repo.to_dict(trade, order) for trade, order in trade_order_pairs]
+                trades = [trade_repo.to_dict(trade, order) for trade, order in trade_order_pairs]
+                return trades, next_cursor, has_more, total_count
         except Exception as e:
             logger.error(f"Error getting trades: {e}")
-            return []
+            return [], None, False, 0
+
+    async def iter_trades(self, account_names: Optional[List[str]] = None,
+                          connector_names: Optional[List[str]] = None,
+                          trading_pairs: Optional[List[str]] = None, trade_types: Optional[List[str]] = None,
+                          start_time: Optional[int] = None, end_time: Optional[int] = None,
+                          limit: Optional[int] = None, cursor_ts: Optional[datetime] = None,
+                          cursor_id: Optional[int] = None) -> AsyncIterator[Dict]:
+        """
+        Stream trade history from the database one trade at a time.
+        :return: Async iterator of trade dictionaries.
+        """
+        await self.ensure_db_initialized()
+
+        async with self.db_manager.get_session_context() as session:
+            trade_repo = TradeRepository(session)
+            async for trade, order in trade_repo.iter_trades_with_orders(
+                account_names=account_names,
+                connector_names=connector_names,
+                trading_pairs=trading_pairs,
+                trade_types=trade_types,
+                start_time=start_time,
+                end_time=end_time,
+                limit=limit,
+                cursor_ts=cursor_ts,
+                cursor_id=cursor_id
+            ):
+                yield trade_repo.to_dict(trade, order)
 
     async def get_account_positions(self, account_name: str, connector_name: str) -> List[Dict]:
         """
@@ -1187,7 +1494,7 @@ class AccountsService:
             HTTPException: If account/connector not found or not perpetual
         """
         # Validate this is a perpetual connector
-        if "_perpetual" not in connector_name:
+        if not connector_name.endswith(PERPETUAL_SUFFIXES):
             raise HTTPException(status_code=400, detail=f"Connector '{connector_name}' is not a perpetual connector")
         
         connector = await self.get_connector_instance(account_name, connector_name)
@@ -1257,6 +1564,37 @@ class AccountsService:
             logger.error(f"Error getting funding payments: {e}")
             return []
 
+    async def get_funding_payments_multi(self, account_name: str, connector_names: List[str],
+                                         trading_pair: str = None, limit: int = 100) -> List[Dict]:
+        """
+        Get funding payment history for an account across several connectors with one query.
+        
+        Args:
+            account_name: Name of the account
+            connector_names: Connectors to include
+            trading_pair: Optional trading pair filter
+            limit: Maximum number of records to return
+            
+        Returns:
+            List of funding payment dictionaries, most recent first
+        """
+        await self.ensure_db_initialized()
+        
+        try:
+            async with self.db_manager.get_session_context() as session:
+                funding_repo = FundingRepository(session)
+                funding_payments = await funding_repo.get_funding_payments_multi(
+                    account_name=account_name,
+                    connector_names=connector_names,
+                    trading_pair=trading_pair,
+                    limit=limit
+                )
+                return [funding_repo.to_dict(payment) for payment in funding_payments]
+                
+        except Exception as e:
+            logger.error(f"Error getting funding payments: {e}")
+            return []
+
     async def get_total_funding_fees(self, account_name: str, connector_name: str, 
                                    trading_pair: str) -> Dict:
         """
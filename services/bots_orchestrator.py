@@ -162,6 +162,52 @@ class BotsOrchestrator:
 
         return {"success": success}
 
+    async def stop_bot_and_wait(self, bot_name, skip_order_cancellation: bool = False, timeout: float = 15.0):
+        """
+        Stop a bot and wait until it reports that its strategy is stopped and its orders are handled.
+        The stop runs synchronously in the bot, so its reply marks the end of the graceful shutdown.
+        """
+        if bot_name not in self.active_bots:
+            logger.warning(f"Bot {bot_name} not found in active bots")
+            return {"success": False, "message": f"Bot {bot_name} not found"}
+        if not self.mqtt_manager.is_connected:
+            return {"success": False, "message": "Not connected to MQTT broker"}
+
+        data = {
+            "skip_order_cancellation": skip_order_cancellation,
+            "async_backend": False,
+        }
+        # Publish first and wait on the reply separately, so a stop that never reached the bot is not mistaken
+        # for a slow shutdown
+        future = await self.mqtt_manager.publish_command_with_reply(bot_name, "stop", data)
+        if future is None:
+            return {"success": False, "message": f"Failed to send stop command to {bot_name}"}
+
+        try:
+            response = await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            response = None
+
+        # Clear performance data after stop command to immediately reflect stopped status
+        self.mqtt_manager.clear_bot_performance(bot_name)
+
+        if response is None:
+            return {
+                "success": True,
+                "message": f"No stop confirmation received from {bot_name} within {timeout} seconds",
+                "timeout": True,
+            }
+
+        # StopCommandMessage.Response carries a status code of 200 on success and an error message otherwise
+        if isinstance(response, dict) and response.get("status", 200) != 200:
+            return {
+                "success": False,
+                "message": f"Bot {bot_name} failed to stop: {response.get('msg') or 'unknown error'}",
+                "data": response,
+            }
+
+        return {"success": True, "data": response}
+
     async def import_strategy_for_bot(self, bot_name, strategy, **kwargs):
         """
         Import a strategy configuration for a bot.
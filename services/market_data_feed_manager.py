@@ -41,6 +41,8 @@ class MarketDataFeedManager:
         self.feed_timeout = feed_timeout
         self.last_access_times: Dict[str, float] = {}
         self.feed_configs: Dict[str, tuple] = {}  # Store feed configs for cleanup
+        # Converted trading rules per (connector, trading pair), valid while the connector keeps the same rule object
+        self._trading_rule_cache: Dict[tuple, tuple] = {}
         self._cleanup_task: Optional[asyncio.Task] = None
         self._is_running = False
         self.logger = logging.getLogger(__name__)
@@ -171,6 +173,40 @@ class MarketDataFeedManager:
         self.logger.debug(f"Accessed order book snapshot: {feed_key}")
         return snapshot
     
+    def _serialize_trading_rule(self, connector_name: str, trading_pair: str, rule) -> Dict:
+        """
+        Convert a trading rule to its response dictionary, reusing the cached conversion while the connector
+        still holds the same rule object.
+        
+        Args:
+            connector_name: Name of the connector
+            trading_pair: Trading pair of the rule
+            rule: The connector's TradingRule
+            
+        Returns:
+            Dictionary with the trading rule fields as JSON-native values
+        """
+        key = (connector_name, trading_pair)
+        cached = self._trading_rule_cache.get(key)
+        if cached is not None and cached[0] is rule:
+            return cached[1]
+        rule_dict = {
+            "min_order_size": float(rule.min_order_size),
+            "max_order_size": float(rule.max_order_size) if rule.max_order_size else None,
+            "min_price_increment": float(rule.min_price_increment),
+            "min_base_amount_increment": float(rule.min_base_amount_increment),
+            "min_quote_amount_increment": float(rule.min_quote_amount_increment),
+            "min_notional_size": float(rule.min_notional_size),
+            "min_order_value": float(rule.min_order_value),
+            "max_price_significant_digits": float(rule.max_price_significant_digits),
+            "supports_limit_orders": rule.supports_limit_orders,
+            "supports_market_orders": rule.supports_market_orders,
+            "buy_order_collateral_token": rule.buy_order_collateral_token,
+            "sell_order_collateral_token": rule.sell_order_collateral_token,
+        }
+        self._trading_rule_cache[key] = (rule, rule_dict)
+        return rule_dict
+    
     async def get_trading_rules(self, connector_name: str, trading_pairs: Optional[List[str]] = None) -> Dict[str, Dict]:
         """
         Get trading rules for specified trading pairs from a connector.
@@ -195,42 +231,16 @@ class MarketDataFeedManager:
                 # Get rules for specific trading pairs
                 result = {}
                 for trading_pair in trading_pairs:
-                    if trading_pair in connector.trading_rules:
-                        rule = connector.trading_rules[trading_pair]
-                        result[trading_pair] = {
-                            "min_order_size": float(rule.min_order_size),
-                            "max_order_size": float(rule.max_order_size) if rule.max_order_size else None,
-                            "min_price_increment": float(rule.min_price_increment),
-                            "min_base_amount_increment": float(rule.min_base_amount_increment),
-                            "min_quote_amount_increment": float(rule.min_quote_amount_increment),
-                            "min_notional_size": float(rule.min_notional_size),
-                            "min_order_value": float(rule.min_order_value),
-                            "max_price_significant_digits": float(rule.max_price_significant_digits),
-                            "supports_limit_orders": rule.supports_limit_orders,
-                            "supports_market_orders": rule.supports_market_orders,
-                            "buy_order_collateral_token": rule.buy_order_collateral_token,
-                            "sell_order_collateral_token": rule.sell_order_collateral_token,
-                        }
+                    rule = connector.trading_rules.get(trading_pair)
+                    if rule is not None:
+                        result[trading_pair] = self._serialize_trading_rule(connector_name, trading_pair, rule)
                     else:
                         result[trading_pair] = {"error": f"Trading pair {trading_pair} not found"}
             else:
                 # Get all trading rules
                 result = {}
                 for trading_pair, rule in connector.trading_rules.items():
-                    result[trading_pair] = {
-                        "min_order_size": float(rule.min_order_size),
-                        "max_order_size": float(rule.max_order_size) if rule.max_order_size else None,
-                        "min_price_increment": float(rule.min_price_increment),
-                        "min_base_amount_increment": float(rule.min_base_amount_increment),
-                        "min_quote_amount_increment": float(rule.min_quote_amount_increment),
-                        "min_notional_size": float(rule.min_notional_size),
-                        "min_order_value": float(rule.min_order_value),
-                        "max_price_significant_digits": float(rule.max_price_significant_digits),
-                        "supports_limit_orders": rule.supports_limit_orders,
-                        "supports_market_orders": rule.supports_market_orders,
-                        "buy_order_collateral_token": rule.buy_order_collateral_token,
-                        "sell_order_collateral_token": rule.sell_order_collateral_token,
-                    }
+                    result[trading_pair] = self._serialize_trading_rule(connector_name, trading_pair, rule)
             
             self.logger.debug(f"Retrieved trading rules for {connector_name}: {len(result)} pairs")
             return result
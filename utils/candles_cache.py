@@ -0,0 +1,76 @@
+import logging
+import os
+from typing import Optional
+
+import pandas as pd
+from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
+from hummingbot.strategy_v2.backtesting.backtesting_data_provider import BacktestingDataProvider
+
+logger = logging.getLogger(__name__)
+
+
+class CachedBacktestingDataProvider(BacktestingDataProvider):
+    """
+    Backtesting data provider that persists fetched candles on disk, one file per connector, pair and interval.
+    Backtests running in other processes, or after a restart, reuse candles that cover their time range
+    instead of downloading them again.
+    """
+
+    def __init__(self, cache_path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.cache_path = cache_path
+
+    def _covers(self, candles_df: Optional[pd.DataFrame]) -> bool:
+        """Check if candles span the current backtesting range, with the same rule as the in-memory cache."""
+        return (candles_df is not None and not candles_df.empty
+                and candles_df["timestamp"].min() <= self.start_time
+                and candles_df["timestamp"].max() >= self.end_time)
+
+    def _read_cache(self, cache_file: str) -> Optional[pd.DataFrame]:
+        """
+        Read cached candles from disk.
+        :param cache_file: Path of the cache file.
+        :return: The cached candles, or None if the file is missing or unreadable.
+        """
+        try:
+            return pd.read_pickle(cache_file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable candles cache {cache_file}: {e}")
+            return None
+
+    def _write_cache(self, cache_file: str, candles_df: pd.DataFrame):
+        """
+        Write candles to disk, replacing the file atomically so concurrent readers never see a partial file.
+        :param cache_file: Path of the cache file.
+        :param candles_df: The candles to cache.
+        """
+        try:
+            os.makedirs(self.cache_path, exist_ok=True)
+            tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+            candles_df.to_pickle(tmp_file)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            logger.warning(f"Could not write candles cache {cache_file}: {e}")
+
+    async def get_candles_feed(self, config: CandlesConfig):
+        """
+        Get candles for the backtesting range from memory, then from the disk cache, then from the exchange.
+        :param config: CandlesConfig
+        :return: The candles DataFrame.
+        """
+        key = self._generate_candle_feed_key(config)
+        if self._covers(self.candles_feeds.get(key)):
+            return self.candles_feeds[key]
+
+        cache_file = os.path.join(self.cache_path, f"{key}.pkl")
+        candles_df = self._read_cache(cache_file)
+        if self._covers(candles_df):
+            self.candles_feeds[key] = candles_df
+            return candles_df
+
+        candles_df = await super().get_candles_feed(config)
+        if candles_df is not None and not candles_df.empty:
+            self._write_cache(cache_file, candles_df)
+        return candles_df
@@ -2,7 +2,7 @@ import asyncio
 import logging
 import time
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional
 
 # Create module-specific logger
 logger = logging.getLogger(__name__)
@@ -20,6 +20,10 @@ from utils.file_system import fs_util
 from utils.hummingbot_api_config_adapter import HummingbotAPIConfigAdapter
 from utils.security import BackendAPISecurity
 
+# Perpetual connector names always end with one of these suffixes (e.g. binance_perpetual, binance_perpetual_testnet)
+PERPETUAL_SUFFIX = "_perpetual"
+PERPETUAL_SUFFIXES = (PERPETUAL_SUFFIX, f"{PERPETUAL_SUFFIX}_testnet")
+
 
 class ConnectorManager:
     """
@@ -32,6 +36,8 @@ class ConnectorManager:
         self.secrets_manager = secrets_manager
         self.db_manager = db_manager
         self._connector_cache: Dict[str, ConnectorBase] = {}
+        # Perpetual connector names per account, derived from the connector cache and rebuilt when it changes
+        self._perpetual_connectors: Dict[str, FrozenSet[str]] = {}
         self._orders_recorders: Dict[str, any] = {}
         self._funding_recorders: Dict[str, any] = {}
         self._status_polling_tasks: Dict[str, asyncio.Task] = {}
@@ -98,14 +104,17 @@ class ConnectorManager:
         if account_name and connector_name:
             cache_key = f"{account_name}:{connector_name}"
             self._connector_cache.pop(cache_key, None)
+            self._perpetual_connectors.pop(account_name, None)
         elif account_name:
             # Clear all connectors for this account
             keys_to_remove = [k for k in self._connector_cache.keys() if k.startswith(f"{account_name}:")]
             for key in keys_to_remove:
                 self._connector_cache.pop(key)
+            self._perpetual_connectors.pop(account_name, None)
         else:
             # Clear entire cache
             self._connector_cache.clear()
+            self._perpetual_connectors.clear()
 
     @staticmethod
     def get_connector_config_map(connector_name: str):
@@ -174,6 +183,23 @@ class ConnectorManager:
             result[account_name][connector_name] = connector
         return result
 
+    def get_perpetual_connectors(self, account_name: str) -> FrozenSet[str]:
+        """
+        Get the initialized perpetual connectors for a specific account.
+        The set is cached per account and rebuilt only after the account's connectors change.
+
+        :param account_name: The name of the account.
+        :return: Frozen set of perpetual connector names.
+        """
+        perpetual_connectors = self._perpetual_connectors.get(account_name)
+        if perpetual_connectors is None:
+            perpetual_connectors = frozenset(
+                connector_name for connector_name in self.list_account_connectors(account_name)
+                if connector_name.endswith(PERPETUAL_SUFFIXES)
+            )
+            self._perpetual_connectors[account_name] = perpetual_connectors
+        return perpetual_connectors
+
     def is_connector_initialized(self, account_name: str, connector_name: str) -> bool:
         """
         Check if a connector is already initialized and cached.
@@ -209,12 +235,13 @@ class ConnectorManager:
         await connector._update_balances()
 
         # Set default position mode to HEDGE for perpetual connectors
-        if "_perpetual" in connector_name:
+        if connector_name.endswith(PERPETUAL_SUFFIXES):
             if PositionMode.HEDGE in connector.supported_position_modes():
                 connector.set_position_mode(PositionMode.HEDGE)
             await connector._update_positions()
 
         self._connector_cache[cache_key] = connector
+        self._perpetual_connectors.pop(account_name, None)
 
         # Load existing orders from database before starting network
         if self.db_manager:
@@ -232,7 +259,7 @@ class ConnectorManager:
                 self._orders_recorders[cache_key] = orders_recorder
 
             # Start funding tracking for perpetual connectors
-            if "_perpetual" in connector_name and cache_key not in self._funding_recorders:
+            if connector_name.endswith(PERPETUAL_SUFFIXES) and cache_key not in self._funding_recorders:
                 # Import FundingRecorder dynamically to avoid circular imports
                 from services.funding_recorder import FundingRecorder
 
@@ -331,7 +358,7 @@ class ConnectorManager:
             await connector._update_trading_rules()
             
             # Update positions for perpetual connectors
-            if "_perpetual" in connector_name:
+            if connector_name.endswith(PERPETUAL_SUFFIXES):
                 await connector._update_positions()
             
             # Update order status for in-flight orders
@@ -523,6 +550,7 @@ class ConnectorManager:
         """
         try:
             files = fs_util.list_files(f"credentials/{account_name}/connectors")
-            return [file.replace(".yml", "") for file in files if file.endswith(".yml")]
+            # Slice off the fixed suffix instead of scanning each name with str.replace
+            return [file[:-4] for file in files if file.endswith(".yml")]
         except FileNotFoundError:
             return []
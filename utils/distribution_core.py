@@ -0,0 +1,57 @@
+from typing import Dict, Hashable, List, Tuple
+
+import numpy as np
+
+
+class KeyInterner:
+    """
+    Maps hashable keys (tokens, (token, account) tuples, ...) to dense integer ids.
+    Ids are assigned in first-seen order so results can be rebuilt in insertion order.
+    """
+
+    def __init__(self):
+        self.ids: Dict[Hashable, int] = {}
+        self.keys: List[Hashable] = []
+
+    def intern(self, key: Hashable) -> int:
+        """
+        Get the id for a key, assigning the next free id if the key is new.
+        :param key: The key to intern.
+        :return: The integer id of the key.
+        """
+        key_id = self.ids.get(key)
+        if key_id is None:
+            key_id = len(self.keys)
+            self.ids[key] = key_id
+            self.keys.append(key)
+        return key_id
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def aggregate(values: np.ndarray, ids: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sum values per group and compute each group's percentage of the grand total.
+    :param values: float64 array of values to accumulate.
+    :param ids: Integer array with the group id of each value.
+    :param n_groups: Number of distinct groups.
+    :return: Tuple of (totals per group, percentage of grand total per group).
+    """
+    totals = np.bincount(ids, weights=values, minlength=n_groups)
+    grand_total = values.sum()
+    if grand_total > 0:
+        percentages = totals / grand_total * 100
+    else:
+        percentages = np.zeros(n_groups, dtype=np.float64)
+    return totals, percentages
+
+
+def group_keys(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compress composite integer keys into dense group ids.
+    :param keys: Integer array of composite keys, one per value.
+    :return: Tuple of (sorted distinct keys, group id of each input key).
+    """
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    return unique_keys, inverse.reshape(-1)
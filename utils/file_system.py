@@ -7,8 +7,9 @@ import os
 logger = logging.getLogger(__name__)
 import shutil
 import sys
+import tempfile
 from pathlib import Path
-from typing import List, Optional, Type
+from typing import Dict, List, Optional, Tuple, Type
 
 import yaml
 from hummingbot.client.config.config_data_types import BaseClientModel
@@ -17,6 +18,9 @@ from hummingbot.strategy_v2.controllers.directional_trading_controller_base impo
 from hummingbot.strategy_v2.controllers.market_making_controller_base import MarketMakingControllerConfigBase
 from hummingbot.strategy_v2.controllers.controller_base import ControllerConfigBase
 
+# PyYAML's libyaml-backed emitter when the C extension is available, with identical output
+_YAML_DUMPER = getattr(yaml, "CDumper", yaml.Dumper)
+
 
 class FileSystemUtil:
     """
@@ -82,6 +86,34 @@ class FileSystemUtil:
             raise NotADirectoryError(f"Path '{directory}' is not a directory")
         return [d for d in os.listdir(dir_path) if os.path.isdir(os.path.join(dir_path, d))]
 
+    def scan_nested_files(self, directory: str, subfolder: str, extension: str) -> Dict[str, Tuple[str, ...]]:
+        """
+        Scans every folder in a directory in a single pass and lists the files with the given extension
+        inside each folder's subfolder. The extension is stripped from the returned names.
+        :param directory: The directory containing the folders to scan.
+        :param subfolder: The subfolder inside each folder holding the files.
+        :param extension: The file extension to match, e.g. '.yml'.
+        :return: Dictionary mapping each folder name to a tuple of file names without extension.
+        :raises FileNotFoundError: If the directory does not exist.
+        """
+        dir_path = self._get_full_path(directory)
+        if not os.path.isdir(dir_path):
+            raise FileNotFoundError(f"Directory '{directory}' not found")
+        result = {}
+        with os.scandir(dir_path) as folders:
+            for folder in folders:
+                if not folder.is_dir():
+                    continue
+                try:
+                    with os.scandir(os.path.join(folder.path, subfolder)) as entries:
+                        result[folder.name] = tuple(
+                            entry.name[:-len(extension)] for entry in entries
+                            if entry.is_file() and entry.name.endswith(extension)
+                        )
+                except (FileNotFoundError, NotADirectoryError):
+                    result[folder.name] = ()
+        return result
+
     def create_folder(self, directory: str, folder_name: str) -> None:
         """
         Creates a folder in a specified directory.
@@ -243,7 +275,7 @@ class FileSystemUtil:
         file_path = self._get_full_path(filename)
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         with open(file_path, 'w', encoding='utf-8') as file:
-            yaml.dump(data_dict, file, default_flow_style=False, allow_unicode=True)
+            yaml.dump(data_dict, file, Dumper=_YAML_DUMPER, default_flow_style=False, allow_unicode=True)
 
     def read_yaml_file(self, file_path: str) -> dict:
         """
@@ -316,14 +348,30 @@ class FileSystemUtil:
     def ensure_file_and_dump_text(self, file_path: str, text: str) -> None:
         """
         Ensures that the directory for the file exists, then writes text to a file.
+        The text is written to a temporary file in the same directory and atomically renamed into place,
+        so readers never see a partially written file.
         :param file_path: The file path to write to (relative to base_path or absolute).
         :param text: The text to write.
         :raises PermissionError: If permission is denied.
         """
         full_path = self._get_full_path(file_path) if not os.path.isabs(file_path) else file_path
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-        with open(full_path, "w", encoding='utf-8') as f:
-            f.write(text)
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding='utf-8', dir=directory, delete=False) as f:
+            tmp_path = f.name
+            try:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                f.close()
+                os.unlink(tmp_path)
+                raise
+        try:
+            os.replace(tmp_path, full_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
     def get_connector_keys_path(self, account_name: str, connector_name: str) -> Path:
         """
@@ -0,0 +1,24 @@
+import hashlib
+from typing import Any, Optional
+
+import orjson
+from fastapi import Request, Response
+
+
+def etag_json_response(request: Request, payload: Any, cache_control: Optional[str] = None) -> Response:
+    """
+    Serialize a JSON-native payload with orjson and tag it with a weak ETag of the body.
+    Clients that send a matching If-None-Match header get an empty 304 instead of the body.
+    :param request: The incoming request.
+    :param payload: The response content, made of JSON-native values only.
+    :param cache_control: Optional Cache-Control header value.
+    :return: A 200 JSON response with the ETag header, or a 304 response.
+    """
+    body = orjson.dumps(payload)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
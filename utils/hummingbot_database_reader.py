@@ -1,24 +1,48 @@
 import os
+import sqlite3
+import numpy as np
 import pandas as pd
 import json
-from typing import List, Dict, Any
+from urllib.parse import quote
+from typing import List, Dict, Any, Optional
 
 from hummingbot.core.data_type.common import TradeType
 from hummingbot.strategy_v2.models.base import RunnableStatus
 from hummingbot.strategy_v2.models.executors import CloseType
 from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
-from sqlalchemy import create_engine, insert, text, MetaData, Table, Column, VARCHAR, INT, FLOAT,  Integer, String, Float
+from sqlalchemy import create_engine, event, insert, text, MetaData, Table, Column, VARCHAR, INT, FLOAT,  Integer, String, Float
 from sqlalchemy.orm import sessionmaker
 
 
+# Per-connection tuning for read-heavy scans: a 64 MiB page cache, memory-mapped reads and in-memory temporary
+# tables for sorts and window functions. None of these settings persist in the database file
+_READ_PRAGMAS = (
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
 class HummingbotDatabase:
     def __init__(self, db_path: str):
         self.db_name = os.path.basename(db_path)
         self.db_path = db_path
         self.db_path = f'sqlite:///{os.path.join(db_path)}'
-        self.engine = create_engine(self.db_path, connect_args={'check_same_thread': False})
+        # Bot databases are only read here, so connections are opened read-only
+        db_uri = f"file:{quote(os.path.abspath(db_path))}?mode=ro"
+        self.engine = create_engine(
+            self.db_path, creator=lambda: sqlite3.connect(db_uri, uri=True, check_same_thread=False)
+        )
+        event.listen(self.engine, "connect", self._tune_connection)
         self.session_maker = sessionmaker(bind=self.engine)
 
+    @staticmethod
+    def _tune_connection(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in _READ_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
     @staticmethod
     def _get_table_status(table_loader):
         try:
@@ -49,18 +73,59 @@ class HummingbotDatabase:
                   }
         return status
 
-    def get_orders(self):
+    def get_orders(self, limit: Optional[int] = None, offset: int = 0, status: Optional[str] = None):
         with self.session_maker() as session:
             query = "SELECT * FROM 'Order'"
-            orders = pd.read_sql_query(text(query), session.connection())
+            params = {}
+            if status:
+                query += " WHERE last_status = :status"
+                params["status"] = status
+            if limit is not None:
+                # Page in SQLite so only the requested rows are loaded into the DataFrame
+                query += " ORDER BY rowid LIMIT :limit OFFSET :offset"
+                params.update(limit=limit, offset=offset)
+            orders = pd.read_sql_query(text(query), session.connection(), params=params)
             orders["amount"] = orders["amount"] / 1e6
             orders["price"] = orders["price"] / 1e6
             orders.rename(columns={"market": "connector_name", "symbol": "trading_pair"}, inplace=True)
         return orders
 
-    def get_trade_fills(self):
+    def get_orders_count(self, status: Optional[str] = None) -> int:
+        with self.session_maker() as session:
+            if status:
+                query = text("SELECT COUNT(*) FROM 'Order' WHERE last_status = :status")
+                return session.execute(query, {"status": status}).scalar()
+            return session.execute(text("SELECT COUNT(*) FROM 'Order'")).scalar()
+
+    def summary_counts(self) -> Dict[str, Any]:
+        """
+        Count the rows of every table and list the distinct trading pairs and exchanges of the orders in SQL,
+        without loading any table into pandas. Distinct values keep the order they first appear in.
+        """
+        with self.session_maker() as session:
+            def distinct(column: str) -> List[str]:
+                query = f"SELECT {column} FROM 'Order' GROUP BY {column} ORDER BY MIN(rowid)"
+                return list(session.execute(text(query)).scalars())
+
+            # All table counts in a single statement
+            counts = session.execute(text(
+                "SELECT (SELECT COUNT(*) FROM 'Order') AS total_orders, "
+                "(SELECT COUNT(*) FROM TradeFill) AS total_trades, "
+                "(SELECT COUNT(*) FROM Executors) AS total_executors, "
+                "(SELECT COUNT(*) FROM Position) AS total_positions, "
+                "(SELECT COUNT(*) FROM Controllers) AS total_controllers"
+            )).mappings().one()
+            return {
+                **counts,
+                "trading_pairs": distinct("symbol"),
+                "exchanges": distinct("market"),
+            }
+
+    def get_trade_fills(self, limit: Optional[int] = None, offset: int = 0):
         groupers = ["config_file_path", "connector_name", "trading_pair"]
         float_cols = ["amount", "price", "trade_fee_in_quote"]
+        if limit is not None:
+            return self._get_trade_fills_page(limit, offset, float_cols)
         with self.session_maker() as session:
             query = "SELECT * FROM TradeFill"
             trade_fills = pd.read_sql_query(text(query), session.connection())
@@ -70,33 +135,84 @@ class HummingbotDatabase:
             trade_fills["trade_fee"] = trade_fills.groupby(groupers)["cum_fees_in_quote"].diff()
         return trade_fills
 
+    def _get_trade_fills_page(self, limit: int, offset: int, float_cols: List[str]) -> pd.DataFrame:
+        """
+        Load one page of trade fills with the same derived fee columns as the full table.
+        The running fee sum is computed by SQLite window functions, so only the page is loaded into pandas.
+        The window pass only reads the grouping and fee columns, full rows are joined back for the page alone.
+        """
+        query = """
+            SELECT TradeFill.*, page.cum_fees_in_quote, page.fill_number, page.fill_rowid FROM (
+                SELECT rowid AS fill_rowid,
+                       SUM(trade_fee_in_quote) OVER fills AS cum_fees_in_quote,
+                       ROW_NUMBER() OVER fills AS fill_number
+                FROM TradeFill
+                WINDOW fills AS (PARTITION BY config_file_path, market, symbol ORDER BY rowid)
+                ORDER BY fill_rowid
+                LIMIT :limit OFFSET :offset
+            ) AS page
+            JOIN TradeFill ON TradeFill.rowid = page.fill_rowid
+            ORDER BY page.fill_rowid
+        """
+        with self.session_maker() as session:
+            trade_fills = pd.read_sql_query(text(query), session.connection(),
+                                            params={"limit": limit, "offset": offset})
+        trade_fills.rename(columns={"market": "connector_name", "symbol": "trading_pair"}, inplace=True)
+        trade_fills[float_cols] = trade_fills[float_cols] / 1e6
+        trade_fills["cum_fees_in_quote"] = trade_fills["cum_fees_in_quote"] / 1e6
+        # The fee difference is undefined for the first fill of each group, as with the full-table diff
+        trade_fills["trade_fee"] = trade_fills["trade_fee_in_quote"].where(trade_fills["fill_number"] > 1)
+        return trade_fills.drop(columns=["fill_number", "fill_rowid"])
+
+    def get_trade_fills_count(self) -> int:
+        with self.session_maker() as session:
+            return session.execute(text("SELECT COUNT(*) FROM TradeFill")).scalar()
+
     def get_order_status(self):
         with self.session_maker() as session:
             query = "SELECT * FROM OrderStatus"
             order_status = pd.read_sql_query(text(query), session.connection())
         return order_status
 
-    def get_executors_data(self) -> pd.DataFrame:
+    def get_executors_data(self, limit: Optional[int] = None, offset: int = 0) -> pd.DataFrame:
         with self.session_maker() as session:
             query = "SELECT * FROM Executors"
-            executors = pd.read_sql_query(text(query), session.connection())
+            params = {}
+            if limit is not None:
+                # Page in SQLite so only the requested rows are loaded into the DataFrame
+                query += " ORDER BY rowid LIMIT :limit OFFSET :offset"
+                params = {"limit": limit, "offset": offset}
+            executors = pd.read_sql_query(text(query), session.connection(), params=params)
         return executors
 
+    def get_executors_count(self) -> int:
+        with self.session_maker() as session:
+            return session.execute(text("SELECT COUNT(*) FROM Executors")).scalar()
+
     def get_controllers_data(self) -> pd.DataFrame:
         with self.session_maker() as session:
             query = "SELECT * FROM Controllers"
             controllers = pd.read_sql_query(text(query), session.connection())
         return controllers
 
-    def get_positions(self) -> pd.DataFrame:
+    def get_positions(self, limit: Optional[int] = None, offset: int = 0) -> pd.DataFrame:
         with self.session_maker() as session:
             query = "SELECT * FROM Position"
-            positions = pd.read_sql_query(text(query), session.connection())
+            params = {}
+            if limit is not None:
+                # Page in SQLite so only the requested rows are loaded into the DataFrame
+                query += " ORDER BY rowid LIMIT :limit OFFSET :offset"
+                params = {"limit": limit, "offset": offset}
+            positions = pd.read_sql_query(text(query), session.connection(), params=params)
             # Convert decimal fields from stored format (divide by 1e6)
             decimal_cols = ["volume_traded_quote", "amount", "breakeven_price", "unrealized_pnl_quote", "cum_fees_quote"]
             positions[decimal_cols] = positions[decimal_cols] / 1e6
         return positions
 
+    def get_positions_count(self) -> int:
+        with self.session_maker() as session:
+            return session.execute(text("SELECT COUNT(*) FROM Position")).scalar()
+
     def calculate_trade_based_performance(self) -> pd.DataFrame:
         """
         Calculate trade-based performance metrics using vectorized pandas operations.
@@ -122,34 +238,36 @@ class HummingbotDatabase:
         trades['sell_amount'] = trades['amount'] * trades['is_sell']
         trades['buy_value'] = trades['price'] * trades['amount'] * trades['is_buy']
         trades['sell_value'] = trades['price'] * trades['amount'] * trades['is_sell']
+        trades['volume_quote'] = trades['price'] * trades['amount']
         
-        # Group by trading_pair and connector_name for rolling calculations
+        # Group by trading_pair and connector_name for rolling calculations. The groups are computed once and
+        # shared by every cumulative and forward-fill step below
         grouper = ['trading_pair', 'connector_name']
+        groups = trades.groupby(grouper, sort=False)
         
-        # Calculate cumulative volumes and values
-        trades['buy_volume'] = trades.groupby(grouper)['buy_amount'].cumsum()
-        trades['sell_volume'] = trades.groupby(grouper)['sell_amount'].cumsum()
-        trades['buy_value_cum'] = trades.groupby(grouper)['buy_value'].cumsum()
-        trades['sell_value_cum'] = trades.groupby(grouper)['sell_value'].cumsum()
+        # Calculate cumulative volumes and values in a single grouped pass
+        trades[['buy_volume', 'sell_volume', 'buy_value_cum', 'sell_value_cum', 'cum_volume_quote']] = groups[
+            ['buy_amount', 'sell_amount', 'buy_value', 'sell_value', 'volume_quote']
+        ].cumsum().to_numpy()
         
-        # Calculate average prices (avoid division by zero)
-        trades['buy_avg_price'] = trades['buy_value_cum'] / trades['buy_volume'].replace(0, pd.NA)
-        trades['sell_avg_price'] = trades['sell_value_cum'] / trades['sell_volume'].replace(0, pd.NA)
+        # Calculate average prices (avoid division by zero). NaN rather than pd.NA keeps the columns float64,
+        # so the arithmetic below stays vectorized instead of falling back to object dtype
+        trades['buy_avg_price'] = trades['buy_value_cum'] / trades['buy_volume'].replace(0, np.nan)
+        trades['sell_avg_price'] = trades['sell_value_cum'] / trades['sell_volume'].replace(0, np.nan)
         
         # Forward fill average prices within each group to handle NaN values
-        trades['buy_avg_price'] = trades.groupby(grouper)['buy_avg_price'].ffill().fillna(0)
-        trades['sell_avg_price'] = trades.groupby(grouper)['sell_avg_price'].ffill().fillna(0)
+        trades[['buy_avg_price', 'sell_avg_price']] = groups[['buy_avg_price', 'sell_avg_price']].ffill().fillna(0)
         
         # Calculate net position
         trades['net_position'] = trades['buy_volume'] - trades['sell_volume']
         
-        # Calculate realized PnL
+        # Calculate realized PnL, which is zero until the group has bought something
         trades['realized_trade_pnl_pct'] = (
-            (trades['sell_avg_price'] - trades['buy_avg_price']) / trades['buy_avg_price']
+            (trades['sell_avg_price'] - trades['buy_avg_price']) / trades['buy_avg_price'].replace(0, np.nan)
         ).fillna(0)
         
         # Matched volume for realized PnL (minimum of buy and sell volumes)
-        trades['matched_volume'] = pd.concat([trades['buy_volume'], trades['sell_volume']], axis=1).min(axis=1)
+        trades['matched_volume'] = np.minimum(trades['buy_volume'], trades['sell_volume'])
         trades['realized_trade_pnl_quote'] = trades['realized_trade_pnl_pct'] * trades['matched_volume'] * trades['buy_avg_price']
         
         # Calculate unrealized PnL based on position direction
@@ -200,10 +318,6 @@ class HummingbotDatabase:
             trades['fees_quote']
         )
         
-        # Calculate cumulative volume in quote currency
-        trades['volume_quote'] = trades['price'] * trades['amount']
-        trades['cum_volume_quote'] = trades.groupby(grouper)['volume_quote'].cumsum()
-        
         # Select and return relevant columns
         result_columns = [
             'timestamp', 'price', 'amount', 'trade_type', 'trading_pair', 'connector_name',
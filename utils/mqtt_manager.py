@@ -325,18 +325,17 @@ class MQTTManager:
 
         logger.info("MQTT client stopped")
 
-    async def publish_command_and_wait(
-        self, bot_id: str, command: str, data: Dict[str, Any], timeout: float = 30.0, qos: int = 1
-    ) -> Optional[Any]:
+    async def publish_command_with_reply(
+        self, bot_id: str, command: str, data: Dict[str, Any], qos: int = 1
+    ) -> Optional[asyncio.Future]:
         """
-        Publish a command to a bot and wait for the response.
+        Publish a command to a bot and return a future that resolves with the bot's response.
 
         :param bot_id: The bot instance ID
         :param command: The command to send
         :param data: Command data
-        :param timeout: Timeout in seconds to wait for response
         :param qos: Quality of Service level
-        :return: Response data if received, None if timeout or error
+        :return: Future resolved with the response data, None if the command could not be published
         """
         if not self._connected or not self._client:
             logger.error("Not connected to MQTT broker")
@@ -346,29 +345,44 @@ class MQTTManager:
         timestamp = int(time.time() * 1000)
         reply_to_topic = f"hummingbot-api/response/{timestamp}"
 
-        # Create a future to track the response using the reply_to topic as key
-        future = asyncio.Future()
+        # Create a future to track the response using the reply_to topic as key. It is dropped from the pending
+        # responses once it resolves, is cancelled or times out
+        future = asyncio.get_running_loop().create_future()
         self._pending_responses[reply_to_topic] = future
+        future.add_done_callback(lambda f: self._discard_pending_response(reply_to_topic, f))
 
-        try:
-            # Send the command with custom reply_to
-            success = await self._publish_command_with_reply_to(bot_id, command, data, reply_to_topic, qos)
-            if not success:
-                self._pending_responses.pop(reply_to_topic, None)
-                return None
+        if not await self._publish_command_with_reply_to(bot_id, command, data, reply_to_topic, qos):
+            future.cancel()
+            return None
+        return future
 
-            # Wait for response with timeout
-            try:
-                response = await asyncio.wait_for(future, timeout=timeout)
-                return response
-            except asyncio.TimeoutError:
-                logger.warning(f"⏰ Timeout waiting for response from {bot_id} for command '{command}' on {reply_to_topic}")
-                self._pending_responses.pop(reply_to_topic, None)
-                return None
+    def _discard_pending_response(self, reply_to_topic: str, future: asyncio.Future):
+        """Remove a finished future from the pending responses, unless the topic already tracks a newer one."""
+        if self._pending_responses.get(reply_to_topic) is future:
+            del self._pending_responses[reply_to_topic]
 
-        except Exception as e:
-            logger.error(f"Error sending command and waiting for response: {e}")
-            self._pending_responses.pop(reply_to_topic, None)
+    async def publish_command_and_wait(
+        self, bot_id: str, command: str, data: Dict[str, Any], timeout: float = 30.0, qos: int = 1
+    ) -> Optional[Any]:
+        """
+        Publish a command to a bot and wait for the response.
+
+        :param bot_id: The bot instance ID
+        :param command: The command to send
+        :param data: Command data
+        :param timeout: Timeout in seconds to wait for response
+        :param qos: Quality of Service level
+        :return: Response data if received, None if timeout or error
+        """
+        future = await self.publish_command_with_reply(bot_id, command, data, qos)
+        if future is None:
+            return None
+
+        # Wait for response with timeout
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⏰ Timeout waiting for response from {bot_id} for command '{command}'")
             return None
 
     async def _publish_command_with_reply_to(
@@ -0,0 +1,42 @@
+import base64
+import re
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+# Cursors pack (microseconds since the epoch, id) as two big-endian int64, 16 bytes or 22 unpadded base64 chars
+_CURSOR_STRUCT = struct.Struct("!qq")
+_PACKED_CURSOR_RE = re.compile(r"^[A-Za-z0-9_-]{22}$")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """
+    Encode a (timestamp, id) keyset position as an opaque URL-safe cursor.
+    Naive timestamps are taken as UTC.
+    :param timestamp: Timestamp of the last row of the page.
+    :param row_id: Primary key of the last row of the page.
+    :return: The encoded cursor.
+    """
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    micros = (timestamp - _EPOCH) // _MICROSECOND
+    return base64.urlsafe_b64encode(_CURSOR_STRUCT.pack(micros, row_id)).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], Optional[int]]:
+    """
+    Decode a cursor produced by encode_cursor into its (timestamp, id) keyset position.
+    Cursors in the older base64 "isoformat|id" form are still accepted.
+    :param cursor: The encoded cursor.
+    :return: Tuple of (UTC timestamp, id), or (None, None) if the cursor is invalid.
+    """
+    try:
+        if _PACKED_CURSOR_RE.match(cursor):
+            micros, row_id = _CURSOR_STRUCT.unpack(base64.urlsafe_b64decode(cursor + "=="))
+            return _EPOCH + timedelta(microseconds=micros), row_id
+        timestamp, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, TypeError, OverflowError, struct.error):
+        return None, None
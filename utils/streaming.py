@@ -0,0 +1,39 @@
+import asyncio
+from typing import AsyncIterator, Iterator, Union
+
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from config import settings
+
+
+class SendTimeoutStreamingResponse(StreamingResponse):
+    """
+    Streaming response that gives up on clients which stop reading.
+    Each chunk must be accepted within send_timeout seconds, otherwise the response is aborted and its body
+    iterator closed, so whatever the iterator holds (a database session, a concurrency slot) is released.
+    """
+
+    def __init__(self, content, send_timeout: float, **kwargs):
+        super().__init__(content, **kwargs)
+        self.send_timeout = send_timeout
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_with_timeout(message):
+            await asyncio.wait_for(send(message), self.send_timeout)
+
+        try:
+            await super().__call__(scope, receive, send_with_timeout)
+        finally:
+            await self.body_iterator.aclose()
+
+
+def ndjson_stream_response(rows: Union[AsyncIterator[bytes], Iterator[bytes]]) -> StreamingResponse:
+    """
+    Build an NDJSON streaming response bounded by the configured history stream send timeout.
+    :param rows: Iterator or async iterator of encoded NDJSON lines.
+    :return: The streaming response.
+    """
+    return SendTimeoutStreamingResponse(
+        rows, send_timeout=settings.database.history_stream_send_timeout, media_type="application/x-ndjson"
+    )
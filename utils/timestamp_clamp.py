@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+
+def month_start(timestamp: datetime) -> datetime:
+    """
+    Get the start of the month of a timestamp.
+    :param timestamp: The timestamp.
+    :return: Midnight of the first day of the timestamp's month, in the same timezone.
+    """
+    return timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def clamp_range(start_time: Optional[datetime], end_time: Optional[datetime],
+                max_span: timedelta = timedelta(days=60), lookback: timedelta = timedelta(days=30),
+                now: Optional[datetime] = None) -> Tuple[Optional[datetime], datetime]:
+    """
+    Bound the time range of a query that only needs the most recent rows inside it, so the database does not
+    scan history that cannot contain the answer.
+    Ranges up to max_span are returned as is. Longer (or open) ranges that include now start at most lookback
+    before now, and longer ranges that end in the past start at most lookback before the start of their end month.
+    :param start_time: Requested start of the range, None for unbounded.
+    :param end_time: Requested end of the range, None for now.
+    :param max_span: Longest range that is left untouched.
+    :param lookback: How far back a clamped range reaches.
+    :param now: Current time, defaults to the current UTC time.
+    :return: Tuple of (start_time, end_time) to query.
+    """
+    now = now or datetime.now(timezone.utc)
+    end_time = end_time or now
+    if start_time is not None and end_time - start_time <= max_span:
+        return start_time, end_time
+    if end_time >= now:
+        floor = now - lookback
+    else:
+        floor = month_start(end_time) - lookback
+    return (floor if start_time is None else max(start_time, floor)), end_time